@@ -0,0 +1,96 @@
+# Allocations made while loading complete Group trees, as traced by
+# tracemalloc.  Blocks and size are what is still allocated once the load
+# returns, which includes memory kept by the interpreter's free lists.  The
+# peak also covers the temporaries created along the way.
+#
+#   python benchmarks/allocations.py
+
+import gc
+import timeit
+import tracemalloc
+
+import graham
+import graham.iterative
+from graham.tests.test_overall import Group, Leaf
+
+
+shapes = (
+    # (width, depth)
+    (4, 5),
+    (8, 4),
+    (2, 10),
+)
+
+
+def tree(width, depth):
+    return Group(
+        name='group',
+        groups=[
+            tree(width=width, depth=depth - 1)
+            for _ in range(width if depth > 0 else 0)
+        ],
+        leaves=[Leaf(name='leaf')],
+    )
+
+
+def traced(function):
+    # caches such as graham.iterative's load plans are filled beforehand
+    function()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        size, peak = tracemalloc.get_traced_memory()
+        blocks = sum(
+            stat.count
+            for stat in tracemalloc.take_snapshot().statistics('filename')
+        )
+    finally:
+        tracemalloc.stop()
+
+    del result
+
+    return blocks, size, peak
+
+
+def best(function, number=5, repeat=7):
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def main():
+    schema = graham.schema(Group)
+    loads = (
+        ('load', lambda data: schema.load(data)),
+        ('iterative', lambda data: graham.iterative.load(Group, data)),
+    )
+
+    header = '{:>6} {:>6} {:>10} {:>10} {:>12} {:>12} {:>10}'
+    row = '{:>6} {:>6} {:>10} {:>10} {:>12} {:>12} {:>10.4f}'
+
+    print(header.format(
+        'width',
+        'depth',
+        'engine',
+        'blocks',
+        'size',
+        'peak',
+        'seconds',
+    ))
+
+    for width, depth in shapes:
+        data = graham.core.dump(tree(width=width, depth=depth)).data
+        for name, load in loads:
+            blocks, size, peak = traced(lambda: load(data))
+            print(row.format(
+                width,
+                depth,
+                name,
+                blocks,
+                size,
+                peak,
+                best(lambda: load(data)),
+            ))
+
+
+if __name__ == '__main__':
+    main()
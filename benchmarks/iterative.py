@@ -0,0 +1,68 @@
+# Compares graham.iterative against the recursive marshmallow path on
+# complete Group trees.
+#
+#   python benchmarks/iterative.py
+
+import timeit
+
+import graham
+import graham.iterative
+from graham.tests.test_overall import Group, Leaf
+
+
+shapes = (
+    # (width, depth)
+    (4, 5),
+    (8, 4),
+    (2, 10),
+)
+
+
+def tree(width, depth):
+    return Group(
+        name='group',
+        groups=[
+            tree(width=width, depth=depth - 1)
+            for _ in range(width if depth > 0 else 0)
+        ],
+        leaves=[Leaf(name='leaf')],
+    )
+
+
+def best(function, number=5, repeat=7):
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def main():
+    schema = graham.schema(Group)
+
+    row = '{:>6} {:>6} {:>8}' + ' {:>12.4f}' * 4
+
+    print('{:>6} {:>6} {:>8}{:>13}{:>13}{:>13}{:>13}'.format(
+        'width',
+        'depth',
+        'nodes',
+        'dump',
+        'iter dump',
+        'load',
+        'iter load',
+    ))
+
+    for width, depth in shapes:
+        instance = tree(width=width, depth=depth)
+        data = graham.core.dump(instance).data
+        nodes = len(graham.core.dumps(instance).data.split('"_type"'))
+
+        print(row.format(
+            width,
+            depth,
+            nodes - 1,
+            best(lambda: schema.dump(instance)),
+            best(lambda: graham.iterative.dump(instance)),
+            best(lambda: schema.load(data)),
+            best(lambda: graham.iterative.load(Group, data)),
+        ))
+
+
+if __name__ == '__main__':
+    main()
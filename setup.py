@@ -54,6 +54,12 @@ setuptools.setup(
             'click',
             'requests',
         ],
+        'lz4': [
+            'lz4',
+        ],
+        'zstd': [
+            'zstandard',
+        ],
     },
     setup_requires=[
         'setuptools_scm',
@@ -8,10 +8,37 @@ except pkg_resources.DistributionNotFound:
     pass
 
 
+from graham.canonical import (
+    content_hash,
+)
+from graham.columns import (
+    dump_columns,
+    load_columns,
+)
 from graham.core import (
     attrib,
     create_metadata,
     dumps,
+    lookup,
+    preload,
     schema,
     schemify,
-)
\ No newline at end of file
+)
+from graham.files import (
+    dump_file,
+    load_file,
+)
+from graham.inplace import (
+    reload,
+)
+from graham.introspection import (
+    describe,
+)
+from graham.stream import (
+    dump_iter,
+    iter_load,
+)
+from graham.validation import (
+    compile_validator,
+    json_schema,
+)
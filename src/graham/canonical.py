@@ -0,0 +1,145 @@
+import datetime
+import hashlib
+import json
+import numbers
+import uuid
+
+import marshmallow
+
+import graham.core
+import graham.iterative
+
+
+# Canonical encoding: sorted keys, no insignificant whitespace and ASCII
+# only output so that equal objects always encode to the same bytes.
+#
+# content_hash() hashes each object's canonical encoding with its nested
+# objects replaced by {"$hash": <digest of the nested object>}.  The digest
+# is written into the hash object chunk by chunk, without building the
+# document string.  Digests of frozen objects holding only immutable values,
+# with nested objects that are also cacheable and held in tuples, are cached
+# on the instance so rehashing after replacing part of a tree only rehashes
+# the new objects and their parents.
+
+hash_attribute_name = '$hash'
+default_algorithm = 'sha256'
+
+_cache_attribute = '_graham_content_hashes'
+
+_immutable_types = (
+    type(None),
+    bool,
+    numbers.Number,
+    marshmallow.compat.basestring,
+    bytes,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    uuid.UUID,
+    type(marshmallow.missing),
+)
+
+encoder = json.JSONEncoder(
+    sort_keys=True,
+    separators=(',', ':'),
+    ensure_ascii=True,
+    allow_nan=False,
+)
+
+
+def dumps(instance):
+    return encoder.encode(graham.iterative.dump(instance))
+
+
+def _immutable(value):
+    if isinstance(value, _immutable_types):
+        return True
+
+    if isinstance(value, (tuple, frozenset)):
+        return all(_immutable(each) for each in value)
+
+    return False
+
+
+def _cache(obj):
+    return getattr(obj, '__dict__', {}).get(_cache_attribute, {})
+
+
+def _cacheable(schema, obj):
+    # Only objects that can't change without being replaced may keep their
+    # digest.  Nested objects are checked on their own so only the
+    # containers holding them are checked here.
+    if not hasattr(obj, '__dict__') or not graham.core.is_frozen(obj):
+        return False
+
+    accessor = schema.get_attribute
+    for name, field in schema.fields.items():
+        if field.load_only:
+            continue
+        value = field.get_value(name, obj, accessor=accessor)
+        if graham.iterative.kind(field) is None:
+            if not _immutable(value):
+                return False
+        elif isinstance(value, (list, set, dict)):
+            return False
+
+    return True
+
+
+def _digest(algorithm, data):
+    hasher = hashlib.new(algorithm)
+    for chunk in encoder.iterencode(data):
+        hasher.update(chunk.encode('ascii'))
+
+    return hasher.hexdigest()
+
+
+_enter = object()
+_exit = object()
+
+
+def content_hash(instance, algorithm=default_algorithm):
+    root = [None]
+    stack = [(_enter, graham.core.schema(instance), instance, root, 0, None)]
+
+    while stack:
+        action, schema, obj, target, key, node = stack.pop()
+
+        if action is _exit:
+            result, children, cacheable = node
+            for _, _, container, index in children:
+                digest, child_cacheable = container[index]
+                container[index] = {hash_attribute_name: digest}
+                cacheable = cacheable and child_cacheable
+
+            digest = _digest(algorithm, result)
+            if cacheable:
+                obj.__dict__.setdefault(_cache_attribute, {})[algorithm] = (
+                    digest
+                )
+            target[key] = (digest, cacheable)
+            continue
+
+        digest = _cache(obj).get(algorithm)
+        if digest is not None:
+            target[key] = (digest, True)
+            continue
+
+        if not graham.iterative.simple_dump(schema):
+            result, errors = schema.dump(obj, many=False)
+            if errors:
+                raise marshmallow.ValidationError(errors, data=result)
+            target[key] = (_digest(algorithm, result), False)
+            continue
+
+        result, children = graham.iterative.dump_node(schema, obj)
+        node = (result, children, _cacheable(schema, obj))
+        stack.append((_exit, schema, obj, target, key, node))
+        stack.extend(
+            (_enter, nested, child, container, index, None)
+            for nested, child, container, index in reversed(children)
+        )
+
+    digest, _ = root[0]
+
+    return digest
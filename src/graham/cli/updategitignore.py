@@ -1,23 +1,162 @@
+import concurrent.futures
+import hashlib
+import json
+import os
+import tempfile
+import time
+
 import click
 import requests
+import requests.adapters
+
+
+default_url = 'https://www.gitignore.io/api/'
+
+
+def read_topics(path):
+    with open(path) as f:
+        return [line.strip() for line in f.readlines() if line.strip()]
+
+
+def cache_path(cache_dir, url):
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, key + '.json')
+
+
+def read_cache(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return None
+
+
+def write_cache(path, entry):
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    # written aside and moved into place so concurrent readers never see a
+    # partial entry
+    fd, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(entry, f)
+    os.replace(temporary, path)
+
+
+def fetch(session, url, cache_dir, ttl, timeout):
+    path = cache_path(cache_dir=cache_dir, url=url)
+    entry = read_cache(path)
+    now = time.time()
+
+    if entry is not None and now - entry['fetched'] < ttl:
+        return entry['text']
+
+    headers = {}
+    if entry is not None:
+        if entry.get('etag') is not None:
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified') is not None:
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    response = session.get(url, headers=headers, timeout=timeout)
+
+    if entry is not None and response.status_code == 304:
+        entry['fetched'] = now
+    else:
+        response.raise_for_status()
+        entry = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched': now,
+            'text': response.text,
+        }
+
+    write_cache(path, entry)
+
+    return entry['text']
+
+
+def write_output(path, local, text):
+    with open(local) as f:
+        local_text = f.read()
+
+    with click.open_file(path, 'w', atomic=True) as output:
+        output.write('# Local\n\n')
+        output.write(local_text.strip() + '\n\n')
+        output.write(text)
+
+
+def create_session(pool_size):
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return session
 
 
 @click.command()
-@click.option('--topics', type=click.File('r'), default='.gitignore.io')
-@click.option('--local', type=click.File('r'), default='.gitignore.local')
+@click.option('--topics', type=click.Path(), default='.gitignore.io')
+@click.option('--local', type=click.Path(), default='.gitignore.local')
+@click.option('--output', type=click.Path(), default='.gitignore')
+@click.option(
+    '--target',
+    'targets',
+    type=(click.Path(), click.Path(), click.Path()),
+    multiple=True,
+    help=(
+        'TOPICS LOCAL OUTPUT file triple, may be repeated.  Replaces'
+        ' --topics, --local and --output.'
+    ),
+)
 @click.option(
-    '--output',
-    type=click.File('w+', atomic=True),
-    default='.gitignore',
+    '--cache-dir',
+    type=click.Path(file_okay=False),
+    default=lambda: os.path.join(click.get_app_dir('graham'), 'gitignore'),
 )
-def cli(topics, local, output):
-    topic_list = [line.strip() for line in topics.readlines()]
+@click.option(
+    '--ttl',
+    type=float,
+    default=24 * 60 * 60,
+    help='Seconds before a cached response is revalidated.',
+)
+@click.option('--timeout', type=float, default=10)
+@click.option('--jobs', type=click.IntRange(min=1), default=4)
+@click.option('--url', default=default_url)
+def cli(topics, local, output, targets, cache_dir, ttl, timeout, jobs, url):
+    if len(targets) == 0:
+        targets = [(topics, local, output)]
 
-    response = requests.get(
-        'https://www.gitignore.io/api/' + ','.join(topic_list),
-    )
-    response.raise_for_status()
+    urls = [
+        url + ','.join(read_topics(target_topics))
+        for target_topics, _, _ in targets
+    ]
+    unique_urls = sorted(set(urls))
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=jobs)
+    with create_session(pool_size=jobs) as session, executor:
+        texts = dict(zip(
+            unique_urls,
+            executor.map(
+                lambda each: fetch(
+                    session=session,
+                    url=each,
+                    cache_dir=cache_dir,
+                    ttl=ttl,
+                    timeout=timeout,
+                ),
+                unique_urls,
+            ),
+        ))
 
-    output.write('# Local\n\n')
-    output.write(local.read().strip() + '\n\n')
-    output.write(response.text)
+    for (_, target_local, target_output), target_url in zip(targets, urls):
+        write_output(
+            path=target_output,
+            local=target_local,
+            text=texts[target_url],
+        )
@@ -0,0 +1,89 @@
+import collections
+
+import marshmallow
+
+import graham.core
+
+
+# Homogeneous lists of objects stored as one array per field with the type
+# and version stated once.
+
+columns_attribute_name = 'columns'
+
+
+def dump_columns(instances, cls=None, key=None):
+    instances = list(instances)
+    if key is not None:
+        instances.sort(key=key)
+
+    if cls is None:
+        if len(instances) == 0:
+            raise ValueError('A class is required to dump no instances')
+        cls = type(instances[0])
+
+    for instance in instances:
+        if type(instance) is not cls:
+            raise graham.core.UnmatchedTypeError(
+                'Expected {} but got {}'.format(
+                    cls.__name__,
+                    type(instance).__name__,
+                ),
+            )
+
+    schema = graham.core.schema(cls)
+    attributes = cls.__graham_graham__
+    accessor = schema.get_attribute
+
+    columns = schema.dict_class()
+    for name, field in schema.fields.items():
+        if field.load_only or name in (
+                graham.core.type_attribute_name,
+                graham.core.version_attribute_name,
+        ):
+            continue
+
+        column = []
+        for instance in instances:
+            value = field.serialize(name, instance, accessor=accessor)
+            if value is marshmallow.utils.missing:
+                value = None
+            column.append(value)
+
+        columns[field.dump_to or name] = column
+
+    result = collections.OrderedDict()
+    result[graham.core.type_attribute_name] = attributes.type
+    if attributes.version is not None:
+        result[graham.core.version_attribute_name] = attributes.version
+    result[columns_attribute_name] = columns
+
+    return result
+
+
+def load_columns(data):
+    cls = graham.core.lookup(data)
+    attributes = cls.__graham_graham__
+
+    columns = data[columns_attribute_name]
+    lengths = {len(column) for column in columns.values()}
+    if len(lengths) > 1:
+        raise marshmallow.ValidationError(
+            'Columns differ in length: {}'.format(sorted(lengths)),
+        )
+
+    common = {graham.core.type_attribute_name: attributes.type}
+    if attributes.version is not None:
+        common[graham.core.version_attribute_name] = attributes.version
+
+    keys = list(columns.keys())
+    rows = []
+    for values in zip(*columns.values()):
+        row = dict(common)
+        row.update(zip(keys, values))
+        rows.append(row)
+
+    loaded, errors = graham.core.schema(cls).load(rows, many=True)
+    if errors:
+        raise marshmallow.ValidationError(errors, data=loaded)
+
+    return loaded
@@ -1,10 +1,12 @@
 import collections
+import gc
+import threading
+import types
+import warnings
 
 import attr
 import marshmallow
 
-from graham.utils import _dict_strip
-
 
 class MissingMetadata(Exception):
     pass
@@ -14,17 +16,29 @@ class UnmatchedTypeError(Exception):
     pass
 
 
+class DuplicateTypeWarning(UserWarning):
+    pass
+
+
 @attr.s
 class Attributes(object):
     schema = attr.ib()
     type = attr.ib()
     version = attr.ib()
+    done = attr.ib(default=None)
+    skipped = attr.ib(default=())
 
 
 metadata_key = object()
 type_attribute_name = '_type'
 version_attribute_name = '_version'
 
+# (type, version) -> class, for dispatching on serialized data.  Replaced
+# rather than modified on registration so lookups can read it without
+# locking.
+registry = {}
+_registry_lock = threading.Lock()
+
 
 @attr.s
 class Metadata(object):
@@ -52,6 +66,34 @@ def validator(expected):
     return validate
 
 
+@attr.s(frozen=True)
+class DoneLookup(object):
+    # Calls the done hook found on each object, if there is one.
+    name = attr.ib()
+
+    def __call__(self, o):
+        m = getattr(o, self.name, None)
+        if m is not None:
+            m()
+
+
+def _resolve_done(cls, done):
+    if done is None:
+        return None
+
+    # A plain function on the class can be called with the object directly.
+    # Anything else, such as static or class methods or a hook only set on
+    # the instance in __attrs_post_init__(), is looked up per object.
+    for klass in cls.__mro__:
+        value = vars(klass).get(done, marshmallow.missing)
+        if value is not marshmallow.missing:
+            if isinstance(value, types.FunctionType):
+                return value
+            break
+
+    return DoneLookup(name=done)
+
+
 def create_schema(cls, tag, options, version, done):
     include = collections.OrderedDict()
     include[type_attribute_name] = marshmallow.fields.String(
@@ -66,6 +108,7 @@ def create_schema(cls, tag, options, version, done):
             validate=validator(version),
         )
 
+    renames = []
     for attribute in attr.fields(cls):
         metadata = attribute.metadata.get(metadata_key)
         if metadata is None:
@@ -80,11 +123,21 @@ def create_schema(cls, tag, options, version, done):
 
         include[attribute.name] = metadata.field
 
+        # attrs strips leading underscores from __init__() parameter names
+        init_name = attribute.name.lstrip('_')
+        if init_name != attribute.name:
+            renames.append((attribute.name, init_name))
+
     meta_dict = {
         'include': include,
     }
     meta_dict.update(options)
 
+    # resolved once here rather than per loaded object
+    versioned = version is not None
+    renames = tuple(renames)
+    done_method = _resolve_done(cls, done)
+
     class Schema(marshmallow.Schema):
         Meta = type(
             'Meta',
@@ -94,22 +147,30 @@ def create_schema(cls, tag, options, version, done):
 
         data_class = cls
 
+        # Set on schemas building objects that still hold placeholders,
+        # whoever fills those in calls the done hook afterwards.
+        defer_done = False
+
         # TODO: seems like this ought to be a static method
         @marshmallow.post_load
         def deserialize(self, data):
             del data[type_attribute_name]
-            if cls.__graham_graham__.version is not None:
+            if versioned:
                 del data[version_attribute_name]
 
+            for name, init_name in renames:
+                if name in data:
+                    data[init_name] = data.pop(name)
+
             o = cls(**data)
-            if done is not None:
-                m = getattr(o, done, None)
-                if m is not None:
-                    m()
+            if done_method is not None and not self.defer_done:
+                done_method(o)
 
             return o
 
     Schema.__name__ = cls.__name__ + 'Schema'
+    # the done hook as actually called, exposed for introspection
+    Schema.done_method = staticmethod(done_method)
     setattr(
         Schema,
         type_attribute_name,
@@ -132,6 +193,121 @@ def dumps(instance, *args, **kwargs):
     return schema(instance).dumps(instance, *args, **kwargs)
 
 
+def checked(result):
+    # Unpacks a load or dump result, raising its errors if there are any.
+    data, errors = result
+    if errors:
+        raise marshmallow.ValidationError(errors, data=data)
+
+    return data
+
+
+def raw_key(data, name, field):
+    # The key in data that the field named name is loaded from.
+    if name not in data and field.load_from:
+        return field.load_from
+
+    return name
+
+
+def _function(method):
+    # Python 2 wraps functions looked up on a class in unbound methods.
+    return getattr(method, '__func__', method)
+
+
+# attrs gives every frozen class the same __setattr__(), it is taken from a
+# throwaway class so that checking needs no assignment to the object.
+_frozen_setattr = _function(
+    attr.make_class('_Frozen', (), frozen=True).__setattr__,
+)
+
+
+def is_frozen(obj):
+    return _function(type(obj).__setattr__) is _frozen_setattr
+
+
+def _qualified_name(cls):
+    return '{}.{}'.format(
+        cls.__module__,
+        getattr(cls, '__qualname__', cls.__name__),
+    )
+
+
+def register_type(cls):
+    global registry
+
+    attributes = cls.__graham_graham__
+    key = (attributes.type, attributes.version)
+    with _registry_lock:
+        existing = registry.get(key)
+        if existing is not None and existing is not cls:
+            warnings.warn(
+                'Type {!r} version {!r} registered for {} replaces {}'.format(
+                    attributes.type,
+                    attributes.version,
+                    _qualified_name(cls),
+                    _qualified_name(existing),
+                ),
+                DuplicateTypeWarning,
+                stacklevel=3,
+            )
+
+        updated = dict(registry)
+        updated[key] = cls
+        registry = updated
+
+
+def lookup(data):
+    type_ = data.get(type_attribute_name)
+    version = data.get(version_attribute_name)
+
+    try:
+        return registry[(type_, version)]
+    except KeyError:
+        raise UnmatchedTypeError(
+            'No class registered for type {!r} version {!r}'.format(
+                type_,
+                version,
+            ),
+        )
+
+
+def preload(cls, serialized, freeze=False, **kwargs):
+    """Load serialized data for sharing with forked worker processes.
+
+    The load runs with the garbage collector paused so that no collection
+    walks the partially built tree.  That alone does not keep the pages
+    holding the tree shared after a fork, collections in the children
+    still write to every tracked object.  To avoid that either pass
+    ``freeze=True`` or call :func:`gc.freeze` yourself right before
+    forking.
+
+    With ``freeze=True`` the whole process heap, not only the loaded tree,
+    is collected and moved to the permanent generation.  This is a process
+    wide side effect and is not undone.  Python versions without
+    :func:`gc.freeze` (before 3.7) only get the collection.
+
+    Remaining keyword arguments are passed to the schema's ``loads()``.
+
+    https://docs.python.org/3/library/gc.html#gc.freeze
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        result = schema(cls).loads(serialized, **kwargs)
+    finally:
+        if enabled:
+            gc.enable()
+
+    if freeze:
+        gc.collect()
+        freeze_all = getattr(gc, 'freeze', None)
+        if freeze_all is not None:
+            freeze_all()
+
+    return result
+
+
 def schema(instance):
     return instance.__graham_graham__.schema
 
@@ -157,8 +333,16 @@ def schemify(
             )(),
             type=tag,
             version=version,
+            done=done,
+            skipped=tuple(
+                attribute.name
+                for attribute in attr.fields(cls)
+                if metadata_key not in attribute.metadata
+            ),
         )
 
+        register_type(cls)
+
         if register:
             marshmallow.class_registry.register(cls.__name__, schema(cls))
 
@@ -16,7 +16,7 @@ class MixedList(marshmallow.fields.Field):
         exclude = kwargs.pop('exclude', ())
         super(MixedList, self).__init__(*args, **kwargs)
 
-        self.instances = []
+        instances = []
         self.exclude = exclude
 
         for cls_or_instance in fields:
@@ -26,47 +26,59 @@ class MixedList(marshmallow.fields.Field):
                     raise ValueError('The type of the list elements '
                                      'must be a subclass of '
                                      'marshmallow.base.FieldABC')
-                self.instances.append(cls_or_instance())
+                instances.append(cls_or_instance())
             else:
                 if not isinstance(cls_or_instance,
                                   marshmallow.fields.FieldABC):
                     raise ValueError('The instances of the list '
                                      'elements must be of type '
                                      'marshmallow.base.FieldABC')
-                self.instances.append(cls_or_instance)
+                instances.append(cls_or_instance)
 
-    def get_cls_or_instance(self, cls_or_instance):
-        if not isinstance(self.instances, dict):
-            instances = {}
-            for instance in self.instances:
-                if isinstance(instance, marshmallow.fields.Nested):
-                    nested = instance.nested
-                    if isinstance(nested, str):
-                        if nested == marshmallow.fields._RECURSIVE_NESTED:
-                            instances[self.parent.__graham_graham__.type] = (
-                                self.parent
-                            )
-                        else:
-                            cls = marshmallow.class_registry.get_class(
-                                nested)
-                            type_ = getattr(
-                                cls,
-                                graham.core.type_attribute_name,
-                            )
-                            instances[type_.constant] = cls
+        self.instances = tuple(instances)
+
+        # Built on first use since nested schemas may refer to classes that
+        # aren't defined yet.  The table is never modified once published
+        # so concurrent readers need no locking.  Racing first uses each
+        # build an equivalent table and the last assignment wins.
+        self._dispatch = None
+
+    def dispatch(self):
+        dispatch = self._dispatch
+        if dispatch is not None:
+            return dispatch
+
+        dispatch = {}
+        for instance in self.instances:
+            if isinstance(instance, marshmallow.fields.Nested):
+                nested = instance.nested
+                if isinstance(nested, str):
+                    if nested == marshmallow.fields._RECURSIVE_NESTED:
+                        type_ = getattr(
+                            self.parent,
+                            graham.core.type_attribute_name,
+                        )
+                        dispatch[type_.constant] = self.parent
                     else:
-                        type_ = getattr(nested, graham.core.type_attribute_name)
-                        instances[type_.constant] = nested
+                        cls = marshmallow.class_registry.get_class(nested)
+                        type_ = getattr(
+                            cls,
+                            graham.core.type_attribute_name,
+                        )
+                        dispatch[type_.constant] = cls
                 else:
-                    type_ = getattr(instance, graham.core.type_attribute_name)
-                    instances[type_.constant] = instance
+                    type_ = getattr(nested, graham.core.type_attribute_name)
+                    dispatch[type_.constant] = nested
+            else:
+                type_ = getattr(instance, graham.core.type_attribute_name)
+                dispatch[type_.constant] = instance
 
-            self.instances = instances
+        self._dispatch = dispatch
 
-        # TODO: handle self referential schema definition
-        # self.cls_or_instance['group'] = Group.schema
+        return dispatch
 
-        return self.instances[cls_or_instance]
+    def get_cls_or_instance(self, cls_or_instance):
+        return self.dispatch()[cls_or_instance]
 
     def _serialize(self, value, attr, obj):
         return [
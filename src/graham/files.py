@@ -0,0 +1,229 @@
+import collections
+import contextlib
+import gzip
+import io
+import json
+import os
+
+import graham.core
+import graham.iterative
+
+
+# File helpers that stream through a (de)compressor rather than holding
+# the whole compressed file in memory.  The compression is chosen from the
+# file extension when writing and from the leading magic bytes when
+# reading.
+
+
+class UnknownCompressionError(Exception):
+    pass
+
+
+# Only gzip is imported up front.  The other codecs are imported when first
+# used since they are not available on every Python build, lzma not at all
+# on Python 2.
+
+
+def _bz2():
+    try:
+        import bz2
+    except ImportError:
+        raise UnknownCompressionError(
+            'bz2 compression is not available in this Python',
+        )
+
+    return bz2
+
+
+def _lzma():
+    try:
+        import lzma
+    except ImportError:
+        raise UnknownCompressionError(
+            'xz compression requires the lzma module, Python 3.3 or later',
+        )
+
+    return lzma
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise UnknownCompressionError(
+            'zstd compression requires the zstandard package',
+        )
+
+    return zstandard
+
+
+def _lz4_frame():
+    try:
+        import lz4.frame
+    except ImportError:
+        raise UnknownCompressionError(
+            'lz4 compression requires the lz4 package',
+        )
+
+    return lz4.frame
+
+
+def _bz2_reader(fileobj):
+    return _bz2().BZ2File(fileobj, mode='rb')
+
+
+def _bz2_writer(fileobj):
+    return _bz2().BZ2File(fileobj, mode='wb')
+
+
+def _xz_reader(fileobj):
+    return _lzma().LZMAFile(fileobj, mode='rb')
+
+
+def _xz_writer(fileobj):
+    return _lzma().LZMAFile(fileobj, mode='wb')
+
+
+def _zstd_reader(fileobj):
+    return _zstandard().ZstdDecompressor().stream_reader(fileobj)
+
+
+def _zstd_writer(fileobj):
+    return _zstandard().ZstdCompressor().stream_writer(fileobj)
+
+
+def _lz4_reader(fileobj):
+    return _lz4_frame().LZ4FrameFile(fileobj, mode='rb')
+
+
+def _lz4_writer(fileobj):
+    return _lz4_frame().LZ4FrameFile(fileobj, mode='wb')
+
+
+Compression = collections.namedtuple(
+    'Compression',
+    ('name', 'extensions', 'magic', 'reader', 'writer'),
+)
+
+compressions = (
+    Compression(
+        name='gzip',
+        extensions=('.gz', '.gzip'),
+        magic=b'\x1f\x8b',
+        reader=lambda fileobj: gzip.GzipFile(fileobj=fileobj, mode='rb'),
+        writer=lambda fileobj: gzip.GzipFile(fileobj=fileobj, mode='wb'),
+    ),
+    Compression(
+        name='bz2',
+        extensions=('.bz2',),
+        magic=b'BZh',
+        reader=_bz2_reader,
+        writer=_bz2_writer,
+    ),
+    Compression(
+        name='xz',
+        extensions=('.xz', '.lzma'),
+        magic=b'\xfd7zXZ\x00',
+        reader=_xz_reader,
+        writer=_xz_writer,
+    ),
+    Compression(
+        name='zstd',
+        extensions=('.zst', '.zstd'),
+        magic=b'\x28\xb5\x2f\xfd',
+        reader=_zstd_reader,
+        writer=_zstd_writer,
+    ),
+    Compression(
+        name='lz4',
+        extensions=('.lz4',),
+        magic=b'\x04\x22\x4d\x18',
+        reader=_lz4_reader,
+        writer=_lz4_writer,
+    ),
+)
+
+_magic_length = max(len(compression.magic) for compression in compressions)
+
+
+def _by_name(name):
+    for compression in compressions:
+        if compression.name == name:
+            return compression
+
+    raise UnknownCompressionError('Unknown compression: {!r}'.format(name))
+
+
+def _by_extension(path):
+    extension = os.path.splitext(path)[1].lower()
+    for compression in compressions:
+        if extension in compression.extensions:
+            return compression
+
+    return None
+
+
+def _by_magic(fileobj):
+    start = fileobj.read(_magic_length)
+    fileobj.seek(0)
+
+    for compression in compressions:
+        if start.startswith(compression.magic):
+            return compression
+
+    return None
+
+
+@contextlib.contextmanager
+def open_file(path, mode='r', compression=None):
+    if mode not in ('r', 'w'):
+        raise ValueError('mode must be r or w, not {!r}'.format(mode))
+
+    with contextlib.ExitStack() as stack:
+        raw = stack.enter_context(open(path, mode + 'b'))
+
+        if compression is not None:
+            compression = _by_name(compression)
+        elif mode == 'r':
+            compression = _by_magic(raw)
+        else:
+            compression = _by_extension(path)
+
+        if compression is None:
+            binary = raw
+        elif mode == 'r':
+            binary = stack.enter_context(compression.reader(raw))
+        else:
+            binary = stack.enter_context(compression.writer(raw))
+
+        text = io.TextIOWrapper(binary, encoding='utf-8', newline='')
+        try:
+            yield text
+        finally:
+            if mode == 'w':
+                text.flush()
+            text.detach()
+
+
+def _json_module(cls_or_instance):
+    if cls_or_instance is None:
+        return json
+
+    return graham.core.schema(cls_or_instance).opts.json_module
+
+
+def load_file(path, cls=None, compression=None):
+    with open_file(path, 'r', compression=compression) as f:
+        json_module = _json_module(cls)
+        data = json_module.load(f)
+
+    if cls is None:
+        cls = graham.core.lookup(data)
+
+    return graham.iterative.load(cls, data)
+
+
+def dump_file(instance, path, compression=None, **kwargs):
+    with open_file(path, 'w', compression=compression) as f:
+        json_module = _json_module(instance)
+        json_module.dump(graham.iterative.dump(instance), f, **kwargs)
@@ -0,0 +1,254 @@
+import attr
+import marshmallow
+
+import graham.core
+import graham.iterative
+
+
+# Reloading serialized data into an existing object tree.  Objects whose
+# type and version match the data are updated in place, only new nodes are
+# allocated.  Frozen objects can't be updated so they are loaded anew and
+# replace the existing object if it differs.  All data is deserialized and
+# validated, including by the attrs converters and validators of changed
+# attributes, before anything is modified so a failed reload leaves the
+# tree untouched.  Assignments then bypass __setattr__() so on_setattr hooks
+# are not run.  Keys absent from the data leave their attributes unchanged.
+
+
+def _matches(obj, data):
+    attributes = getattr(obj, '__graham_graham__', None)
+    if attributes is None or not isinstance(data, marshmallow.compat.Mapping):
+        return False
+
+    return (
+        data.get(graham.core.type_attribute_name) == attributes.type
+        and data.get(graham.core.version_attribute_name) == attributes.version
+    )
+
+
+def _load_new(field, field_kind, data):
+    if field_kind == graham.iterative.NESTED:
+        schema = field.schema
+    elif field_kind == graham.iterative.LIST:
+        schema = field.container.schema
+    else:
+        schema = graham.iterative.mixed_schema(field, data)
+
+    return graham.core.checked(schema.load(data, many=False))
+
+
+def _replacement(field, field_kind, current, data):
+    new = _load_new(field, field_kind, data)
+    if new == current:
+        return current
+
+    return new
+
+
+def _converted(obj, attribute, value):
+    field = attr.fields_dict(type(obj)).get(attribute)
+    if field is not None and field.converter is not None:
+        value = field.converter(value)
+
+    return value
+
+
+def _assignment(obj, attribute, value):
+    field = attr.fields_dict(type(obj)).get(attribute)
+    if field is not None and field.validator is not None:
+        field.validator(obj, field, value)
+
+    return obj, attribute, value
+
+
+def _key_value(key, obj_or_data):
+    if isinstance(obj_or_data, marshmallow.compat.Mapping):
+        return obj_or_data.get(key)
+
+    return getattr(obj_or_data, key, None)
+
+
+def _match_children(current, items, key):
+    # Pairs each item of data with an existing child to update in place or
+    # with None where a new child has to be loaded.
+    if key is None:
+        return [
+            current[index]
+            if index < len(current) and _matches(current[index], item)
+            else None
+            for index, item in enumerate(items)
+        ]
+
+    by_key = {}
+    for child in current:
+        by_key.setdefault(_key_value(key, child), child)
+
+    matched = []
+    for item in items:
+        child = by_key.pop(_key_value(key, item), None)
+        if child is not None and not _matches(child, item):
+            child = None
+        matched.append(child)
+
+    return matched
+
+
+def reload(instance, data, key=None):
+    if not _matches(instance, data):
+        raise graham.core.UnmatchedTypeError(
+            'Data of type {!r} can not be loaded into {}'.format(
+                data.get(graham.core.type_attribute_name),
+                type(instance).__name__,
+            ),
+        )
+
+    if graham.core.is_frozen(instance):
+        raise TypeError(
+            'Frozen {} can not be reloaded in place'.format(
+                type(instance).__name__,
+            ),
+        )
+
+    assignments = []
+    replacements = []
+    changed = []
+    changed_objects = []
+
+    stack = [(graham.core.schema(instance), instance, data, ())]
+    while stack:
+        schema, obj, data, path = stack.pop()
+        accessor = schema.get_attribute
+        children = []
+        obj_changed = False
+
+        for name, field in schema.fields.items():
+            if field.dump_only or name in (
+                    graham.core.type_attribute_name,
+                    graham.core.version_attribute_name,
+            ):
+                continue
+
+            raw_key = graham.core.raw_key(data, name, field)
+            if raw_key not in data:
+                continue
+
+            value = data[raw_key]
+            attribute = field.attribute or name
+            current = field.get_value(name, obj, accessor=accessor)
+            field_path = path + (name,)
+            field_kind = graham.iterative.kind(field)
+
+            many = field_kind in (
+                graham.iterative.LIST,
+                graham.iterative.MIXED,
+            ) or (
+                field_kind == graham.iterative.NESTED
+                and (field.many or field.schema.many)
+            )
+
+            if (
+                field_kind is None
+                or value is None
+                or current is None
+                or current is marshmallow.utils.missing
+                or (many and not marshmallow.utils.is_collection(value))
+            ):
+                try:
+                    new = field.deserialize(value, raw_key, data)
+                except marshmallow.ValidationError as e:
+                    raise marshmallow.ValidationError(
+                        {graham.iterative.format_path(field_path): e.messages},
+                    )
+                new = _converted(obj, attribute, new)
+                if new != current:
+                    assignments.append(_assignment(obj, attribute, new))
+                    changed.append(field_path)
+                    obj_changed = True
+                continue
+
+            if not many:
+                if not _matches(current, value):
+                    new = _load_new(field, field_kind, value)
+                elif graham.core.is_frozen(current):
+                    new = _replacement(field, field_kind, current, value)
+                else:
+                    children.append((field.schema, current, value, field_path))
+                    continue
+
+                if new is not current:
+                    assignments.append(_assignment(
+                        obj,
+                        attribute,
+                        _converted(obj, attribute, new),
+                    ))
+                    changed.append(field_path)
+                    obj_changed = True
+                continue
+
+            items = list(value)
+            current_children = list(current)
+            if field_kind == graham.iterative.MIXED:
+                # excluded instances are never dumped so, as with a full
+                # load, they do not survive a reload
+                current_children = [
+                    child for child in current_children
+                    if not isinstance(child, field.exclude)
+                ]
+            matched = _match_children(
+                current=current_children,
+                items=items,
+                key=key,
+            )
+
+            new_children = []
+            for index, (child, item) in enumerate(zip(matched, items)):
+                if child is None:
+                    child = _load_new(field, field_kind, item)
+                elif graham.core.is_frozen(child):
+                    child = _replacement(field, field_kind, child, item)
+                else:
+                    children.append((
+                        graham.core.schema(child),
+                        child,
+                        item,
+                        field_path + (index,),
+                    ))
+                new_children.append(child)
+
+            if (
+                len(new_children) != len(current)
+                or any(
+                    new is not old
+                    for new, old in zip(new_children, current)
+                )
+            ):
+                if isinstance(current, list):
+                    replacements.append((current, new_children))
+                else:
+                    new = type(current)(new_children)
+                    assignments.append(_assignment(
+                        obj,
+                        attribute,
+                        _converted(obj, attribute, new),
+                    ))
+                changed.append(field_path)
+                obj_changed = True
+
+        if obj_changed:
+            changed_objects.append(obj)
+
+        stack.extend(reversed(children))
+
+    for obj, attribute, value in assignments:
+        object.__setattr__(obj, attribute, value)
+
+    for current, new_children in replacements:
+        current[:] = new_children
+
+    # children come after their parents in visiting order
+    for obj in reversed(changed_objects):
+        done_method = type(graham.core.schema(obj)).done_method
+        if done_method is not None:
+            done_method(obj)
+
+    return changed
@@ -0,0 +1,146 @@
+import attr
+import marshmallow
+
+import graham.core
+import graham.iterative
+import graham.validation
+
+
+@attr.s(frozen=True)
+class FieldDescription(object):
+    name = attr.ib()
+    field = attr.ib()
+    dump_key = attr.ib()
+    load_key = attr.ib()
+    required = attr.ib()
+    kind = attr.ib()
+
+    def format(self):
+        details = [type(self.field).__name__]
+        if self.kind is not None:
+            details.append(self.kind)
+        if self.required:
+            details.append('required')
+        if self.dump_key != self.name:
+            details.append('dump to {!r}'.format(self.dump_key))
+        if self.load_key != self.name:
+            details.append('load from {!r}'.format(self.load_key))
+
+        return '{}: {}'.format(self.name, ', '.join(details))
+
+
+@attr.s(frozen=True)
+class Description(object):
+    cls = attr.ib()
+    tag = attr.ib()
+    version = attr.ib()
+    schema = attr.ib()
+    fields = attr.ib()
+    skipped = attr.ib()
+    done = attr.ib()
+    done_method = attr.ib()
+    processors = attr.ib()
+    registered = attr.ib()
+    class_registered = attr.ib()
+    fast_dump = attr.ib()
+    fast_load = attr.ib()
+    code = attr.ib(default=None)
+
+    def format(self):
+        lines = [
+            graham.core._qualified_name(self.cls),
+            '  tag: {!r}'.format(self.tag),
+            '  version: {!r}'.format(self.version),
+            '  schema: {}'.format(type(self.schema).__name__),
+            '  fields:',
+        ]
+        lines.extend('    ' + field.format() for field in self.fields)
+        lines.append('  skipped: {}'.format(', '.join(self.skipped) or '-'))
+        if self.done_method is None:
+            done = '-'
+        elif isinstance(self.done_method, graham.core.DoneLookup):
+            done = '{} (looked up per object)'.format(self.done)
+        else:
+            done = '{} ({})'.format(
+                self.done,
+                graham.core._qualified_name(self.done_method),
+            )
+        lines.append('  done: {}'.format(done))
+        lines.append('  processors: {}'.format(', '.join(
+            '{} {}'.format(tag, name) for tag, name in self.processors
+        ) or '-'))
+        lines.append('  registered: {}'.format(self.registered))
+        lines.append('  marshmallow class registry: {}'.format(
+            self.class_registered,
+        ))
+        lines.append('  dump path: {}'.format(
+            'fast' if self.fast_dump else 'marshmallow',
+        ))
+        lines.append('  load path: {}'.format(
+            'fast' if self.fast_load else 'marshmallow',
+        ))
+
+        if self.code is not None:
+            lines.append('  generated validator:')
+            lines.extend(
+                ('    ' + line).rstrip() for line in self.code.splitlines()
+            )
+
+        return '\n'.join(lines) + '\n'
+
+
+def _class_registered(cls, schema):
+    try:
+        registered = marshmallow.class_registry.get_class(cls.__name__)
+    except marshmallow.exceptions.RegistryError:
+        return False
+
+    return registered is schema
+
+
+def describe(cls, code=False):
+    attributes = cls.__graham_graham__
+    schema = attributes.schema
+
+    fields = tuple(
+        FieldDescription(
+            name=name,
+            field=field,
+            dump_key=field.dump_to or name,
+            load_key=field.load_from or name,
+            required=field.required,
+            kind=graham.iterative.kind(field),
+        )
+        for name, field in schema.fields.items()
+    )
+
+    processors = tuple(
+        (tag, name)
+        for (tag, _), names in sorted(schema.__processors__.items())
+        for name in names
+    )
+
+    registered = attributes.type, attributes.version
+    registered = graham.core.registry.get(registered) is cls
+
+    if code:
+        code = graham.validation.compile_validator(cls).source
+    else:
+        code = None
+
+    return Description(
+        cls=cls,
+        tag=attributes.type,
+        version=attributes.version,
+        schema=schema,
+        fields=fields,
+        skipped=attributes.skipped,
+        done=attributes.done,
+        done_method=type(schema).done_method,
+        processors=processors,
+        registered=registered,
+        class_registered=_class_registered(cls, schema),
+        fast_dump=graham.iterative.simple_dump(schema),
+        fast_load=graham.iterative.load_plan(schema) is not None,
+        code=code,
+    )
@@ -0,0 +1,758 @@
+import collections
+import itertools
+
+import attr
+import marshmallow
+import marshmallow.compat
+import marshmallow.decorators
+import marshmallow.utils
+
+import graham.core
+import graham.fields
+
+
+# Dump and load engines that walk the object tree with an explicit stack
+# rather than recursing through marshmallow's Nested fields.  Output matches
+# graham.core.dump() and graham.schema(cls).load() while allowing for trees
+# deeper than the interpreter's recursion limit.
+#
+# That holds for dump() and load() which work with plain data.  dumps() and
+# loads() hand that data to the schema's JSON module, the standard library
+# json module encodes and decodes recursively and raises RecursionError for
+# documents nested deeper than about the recursion limit.  Use dump() and
+# load() with a non-recursive JSON library for such documents.
+#
+# With references=True each object instance is written once.  Instances
+# reached again are written as {"$ref": id} and the first occurrence gets an
+# "$id" entry.  This shrinks documents with shared instances and allows for
+# cycles.  When loading, a reference to an object that isn't complete yet is
+# passed to the class as a Reference placeholder and filled in once the
+# whole document has been loaded.  The done hook of such objects is only
+# called after that but attrs validators and converters run in __init__()
+# and do see the placeholders.
+
+
+missing = marshmallow.utils.missing
+
+NESTED = 'nested'
+LIST = 'list'
+MIXED = 'mixed'
+
+_enter = object()
+_exit = object()
+
+_dump_tags = (
+    marshmallow.decorators.PRE_DUMP,
+    marshmallow.decorators.POST_DUMP,
+)
+_load_tags = (
+    marshmallow.decorators.PRE_LOAD,
+    marshmallow.decorators.VALIDATES_SCHEMA,
+)
+_plan_attribute = '_graham_load_plan'
+
+id_attribute_name = '$id'
+reference_attribute_name = '$ref'
+
+
+@attr.s(frozen=True)
+class Reference(object):
+    identifier = attr.ib()
+
+
+def _is_mapping(value):
+    # Checking for a plain dict first skips the comparatively slow abstract
+    # base class check for the common case of data from a JSON parser.
+    return type(value) is dict or isinstance(value, marshmallow.compat.Mapping)
+
+
+def _is_collection(value):
+    return type(value) is list or marshmallow.utils.is_collection(value)
+
+
+def is_reference(data):
+    return (
+        _is_mapping(data)
+        and len(data) == 1
+        and reference_attribute_name in data
+    )
+
+
+def _identify(result, counter):
+    identifier = result.get(id_attribute_name)
+    if identifier is None:
+        identifier = next(counter)
+        result[id_attribute_name] = identifier
+        move_to_end = getattr(result, 'move_to_end', None)
+        if move_to_end is not None:
+            move_to_end(id_attribute_name, last=False)
+
+    return identifier
+
+
+def kind(field):
+    if isinstance(field, graham.fields.MixedList):
+        return MIXED
+
+    if isinstance(field, marshmallow.fields.List):
+        field = field.container
+        nested_kind = LIST
+    else:
+        nested_kind = NESTED
+
+    if not isinstance(field, marshmallow.fields.Nested):
+        return None
+
+    if isinstance(field.only, marshmallow.compat.basestring):
+        # single field 'plucking' returns values rather than objects
+        return None
+
+    if nested_kind == LIST and field.many:
+        return None
+
+    return nested_kind
+
+
+def mixed_schema(field, data):
+    schema = field.get_cls_or_instance(
+        data[graham.core.type_attribute_name],
+    )
+    if isinstance(schema, type):
+        schema = schema()
+
+    return schema
+
+
+def _uses_processors(schema, tags):
+    processors = schema.__processors__
+    return any(
+        processors.get((tag, pass_many))
+        for tag in tags
+        for pass_many in (False, True)
+    )
+
+
+def _passes_original(schema, tag):
+    for name in schema.__processors__.get((tag, False), ()):
+        processor_kwargs = getattr(schema, name).__marshmallow_kwargs__
+        if processor_kwargs[(tag, False)].get('pass_original', False):
+            return True
+
+    return False
+
+
+def simple_dump(schema):
+    return not (
+        schema.extra
+        or schema.prefix
+        or _uses_processors(schema, _dump_tags)
+    )
+
+
+def dump_node(schema, obj):
+    # Dumps the object's own fields.  Nested objects are left as None
+    # placeholders in the result and returned as (schema, object,
+    # container, key) for the caller to fill in.
+    accessor = schema.get_attribute
+    result = schema.dict_class()
+    children = []
+
+    for name, field in schema.fields.items():
+        if field.load_only:
+            continue
+
+        out = field.dump_to or name
+        field_kind = kind(field)
+
+        if field_kind is None:
+            value = field.serialize(name, obj, accessor=accessor)
+            if value is not missing:
+                result[out] = value
+            continue
+
+        value = field.get_value(name, obj, accessor=accessor)
+        if value is missing:
+            value = field.default
+            if callable(value):
+                value = value()
+            if value is not missing:
+                result[out] = value
+            continue
+
+        if value is None:
+            result[out] = None
+            continue
+
+        if field_kind == NESTED:
+            nested = field.schema
+            if nested.many or field.many:
+                items = list(value)
+                schemas = [nested] * len(items)
+            else:
+                result[out] = None
+                children.append((nested, value, result, out))
+                continue
+        elif field_kind == LIST:
+            nested = field.container.schema
+            if marshmallow.utils.is_collection(value):
+                items = list(value)
+            else:
+                items = [value]
+            schemas = [nested] * len(items)
+        else:
+            items = [
+                each
+                for each in value
+                if not isinstance(each, field.exclude)
+            ]
+            schemas = [graham.core.schema(each) for each in items]
+
+        values = [None] * len(items)
+        result[out] = values
+        children.extend(
+            (nested, item, values, index)
+            for index, (nested, item) in enumerate(zip(schemas, items))
+        )
+
+    return result, children
+
+
+def dump(instance, references=False):
+    root = [None]
+    stack = [(graham.core.schema(instance), instance, root, 0)]
+    results = {}
+    counter = itertools.count()
+
+    while stack:
+        schema, obj, target, key = stack.pop()
+
+        if references:
+            result = results.get(id(obj))
+            if result is not None:
+                target[key] = {
+                    reference_attribute_name: _identify(result, counter),
+                }
+                continue
+
+        if not simple_dump(schema):
+            result = graham.core.checked(schema.dump(obj, many=False))
+            target[key] = result
+            results[id(obj)] = result
+            continue
+
+        result, children = dump_node(schema, obj)
+        target[key] = result
+        if references:
+            results[id(obj)] = result
+
+        stack.extend(reversed(children))
+
+    return root[0]
+
+
+class Loaded(marshmallow.fields.Field):
+    def __init__(self, convert=None, **kwargs):
+        super(Loaded, self).__init__(**kwargs)
+        self.convert = convert
+
+    def _deserialize(self, value, attr, data):
+        if self.convert is not None:
+            value = self.convert(value)
+
+        return value
+
+
+LoadPlan = collections.namedtuple(
+    'LoadPlan',
+    ('shallow', 'deferred', 'nested'),
+)
+
+
+def _copy_schema(schema):
+    return type(schema)(
+        only=schema.only,
+        exclude=schema.exclude,
+        strict=False,
+        context=schema.context,
+        load_only=schema.load_only,
+        dump_only=schema.dump_only,
+        partial=schema.partial,
+    )
+
+
+def _create_load_plan(schema):
+    if (
+        _uses_processors(schema, _load_tags)
+        or schema.__processors__.get((marshmallow.decorators.POST_LOAD, True))
+        or _passes_original(schema, marshmallow.decorators.POST_LOAD)
+    ):
+        return None
+
+    shallow = _copy_schema(schema)
+    deferred = _copy_schema(schema)
+    deferred.defer_done = True
+
+    fields = shallow.dict_class()
+    nested = []
+    for name, field in schema.fields.items():
+        field_kind = kind(field)
+        if field_kind is None or field.dump_only:
+            fields[name] = field
+            continue
+
+        if isinstance(field, graham.fields.Tuple):
+            convert = tuple
+        else:
+            convert = None
+
+        loaded = Loaded(
+            convert=convert,
+            attribute=field.attribute,
+            load_from=field.load_from,
+            required=field.required,
+            allow_none=field.allow_none,
+            missing=field.missing,
+            validate=field.validators,
+            error_messages=field.error_messages,
+        )
+        loaded._add_to_schema(name, shallow)
+        fields[name] = loaded
+        nested.append((name, field, field_kind))
+
+    shallow.fields = fields
+    deferred.fields = fields
+
+    return LoadPlan(shallow=shallow, deferred=deferred, nested=tuple(nested))
+
+
+def load_plan(schema):
+    plan = schema.__dict__.get(_plan_attribute, missing)
+    if plan is missing:
+        plan = _create_load_plan(schema)
+        setattr(schema, _plan_attribute, plan)
+
+    return plan
+
+
+# Stands in for the schema of a MixedList element that can't be loaded.
+_Undispatched = collections.namedtuple('_Undispatched', ('messages',))
+
+
+def _element_schema(field, data):
+    if is_reference(data):
+        return None
+
+    if not _is_mapping(data):
+        return _Undispatched(messages=['Invalid input type.'])
+
+    type_ = data.get(graham.core.type_attribute_name)
+    try:
+        return mixed_schema(field, data)
+    except KeyError:
+        return _Undispatched(messages={
+            graham.core.type_attribute_name: [
+                'Unknown type: {!r}'.format(type_),
+            ],
+        })
+
+
+def _child_schemas(field, field_kind, value):
+    # Returns None when the value isn't shaped as expected so that the field
+    # itself can produce the regular error.
+    if field_kind == NESTED:
+        nested = field.schema
+        if not nested.many:
+            if not _is_mapping(value):
+                return None
+            return nested
+        items = value
+        schemas = [nested] * len(value)
+    elif field_kind == LIST:
+        nested = field.container.schema
+        if nested.many:
+            return None
+        items = value
+        schemas = [nested] * len(value)
+    else:
+        # each element gets its own frame, even those that can't be
+        # dispatched, so that their errors are reported per element
+        return [_element_schema(field, each) for each in value]
+
+    if not all(_is_mapping(each) for each in items):
+        return None
+
+    return schemas
+
+
+def _holds_placeholders(plan, data):
+    for name, field, field_kind in plan.nested:
+        value = data.get(graham.core.raw_key(data, name, field))
+        if isinstance(value, Reference):
+            return True
+        if isinstance(value, list):
+            if any(isinstance(each, Reference) for each in value):
+                return True
+
+    return False
+
+
+def _unresolved(instance, plan):
+    for name, field, field_kind in plan.nested:
+        attribute = field.attribute or name
+        value = getattr(instance, attribute, None)
+        if isinstance(value, Reference):
+            yield attribute
+        elif isinstance(value, (list, tuple)):
+            if any(isinstance(each, Reference) for each in value):
+                yield attribute
+
+
+def _resolve(objects, value):
+    if not isinstance(value, Reference):
+        return value
+
+    resolved = objects.get(value.identifier, missing)
+    if resolved is missing:
+        raise marshmallow.ValidationError(
+            'Unresolved reference: {!r}'.format(value.identifier),
+        )
+
+    return resolved
+
+
+LoadError = collections.namedtuple(
+    'LoadError',
+    ('path', 'messages', 'skipped'),
+)
+
+
+def _nest(path, messages):
+    # Places messages at the same depth as marshmallow's own nested errors.
+    for key in reversed(path):
+        messages = {key: messages}
+
+    return messages
+
+
+def format_path(path):
+    return '/'.join(str(each) for each in path)
+
+
+@attr.s(frozen=True)
+class ErrorPolicy(object):
+    # max_errors=1 fails at the first error, None collects them all.  With
+    # skip_invalid=True MixedList elements that fail to load are dropped
+    # from the result and reported rather than failing the load.  A policy
+    # is only configuration, so one can be shared between threads, what
+    # went wrong is recorded in a LoadReport per load.
+    max_errors = attr.ib(default=None)
+    skip_invalid = attr.ib(default=False)
+
+
+@attr.s
+class LoadReport(object):
+    # The errors of a single load, failures counts those that weren't
+    # skipped.  The ValidationError raised by a failed load carries its
+    # report as .report, pass report= to load() to also see what was
+    # skipped by a load that succeeded.
+    errors = attr.ib(default=attr.Factory(list))
+    failures = attr.ib(default=0)
+
+    def record(self, path, messages, skipped):
+        self.errors.append(LoadError(
+            path=path,
+            messages=messages,
+            skipped=skipped,
+        ))
+
+        if not skipped:
+            self.failures += 1
+
+    def error(self):
+        error = marshmallow.ValidationError({
+            format_path(error.path): error.messages
+            for error in self.errors
+            if not error.skipped
+        })
+        error.report = self
+
+        return error
+
+
+# Marks the result slot of an object that failed to load, or of a MixedList
+# element that has been skipped, while loading under an ErrorPolicy.
+_failed = object()
+_skipped = object()
+
+_Frame = collections.namedtuple(
+    '_Frame',
+    (
+        'action',
+        'schema',
+        'data',
+        'target',
+        'key',
+        'identifier',
+        'path',
+        'element',
+        'tolerated',
+    ),
+)
+
+
+def _prune(plan, data):
+    failed = False
+    for name, field, field_kind in plan.nested:
+        raw_key = graham.core.raw_key(data, name, field)
+        value = data.get(raw_key)
+        if value is _failed:
+            failed = True
+        elif isinstance(value, list):
+            if any(each is _failed for each in value):
+                failed = True
+            if field_kind == MIXED:
+                value[:] = [each for each in value if each is not _skipped]
+
+    return failed
+
+
+def load(cls, data, references=False, policy=None, report=None):
+    root = [None]
+    stack = [_Frame(
+        action=_enter,
+        schema=graham.core.schema(cls),
+        data=data,
+        target=root,
+        key=0,
+        identifier=missing,
+        path=(),
+        element=False,
+        tolerated=False,
+    )]
+    objects = {}
+    placeholders = False
+    fixups = []
+    deferred = []
+    if report is not None and policy is None:
+        # asking for a report means errors are to be collected
+        policy = ErrorPolicy()
+    if policy is not None and report is None:
+        report = LoadReport()
+    skip_invalid = policy is not None and policy.skip_invalid
+
+    def record(path, messages, skipped):
+        report.record(path, messages, skipped)
+        if not skipped and policy.max_errors is not None:
+            if report.failures >= policy.max_errors:
+                raise report.error()
+
+    def complete(frame):
+        plan = frame.schema
+        data = frame.data
+        target = frame.target
+        key = frame.key
+
+        if report is not None and report.errors:
+            if _prune(plan, data):
+                errors = plan.shallow.validate(data)
+                if errors:
+                    record(frame.path, errors, frame.tolerated)
+                target[key] = _skipped if frame.element else _failed
+                return
+
+        if placeholders and _holds_placeholders(plan, data):
+            instance = graham.core.checked(plan.deferred.load(data))
+            fixups.extend(
+                (instance, attribute)
+                for attribute in _unresolved(instance, plan)
+            )
+            deferred.append(instance)
+        else:
+            instance = graham.core.checked(plan.shallow.load(data))
+
+        target[key] = instance
+        if frame.identifier is not missing:
+            objects[frame.identifier] = instance
+
+    while stack:
+        frame = stack.pop()
+        target = frame.target
+        key = frame.key
+
+        try:
+            if frame.action is _exit:
+                complete(frame)
+                continue
+
+            data = frame.data
+            identifier = missing
+
+            if references:
+                if is_reference(data):
+                    reference = Reference(data[reference_attribute_name])
+                    target[key] = objects.get(reference.identifier, reference)
+                    placeholders = placeholders or target[key] is reference
+                    continue
+
+                if (
+                    _is_mapping(data)
+                    and id_attribute_name in data
+                ):
+                    data = dict(data)
+                    identifier = data.pop(id_attribute_name)
+
+            schema = frame.schema
+            if isinstance(schema, _Undispatched):
+                raise marshmallow.ValidationError(schema.messages)
+
+            plan = load_plan(schema)
+            if (
+                plan is None
+                or not _is_mapping(data)
+            ):
+                target[key] = graham.core.checked(
+                    schema.load(data, many=False),
+                )
+                if identifier is not missing:
+                    objects[identifier] = target[key]
+                continue
+
+            data = dict(data)
+            children = []
+            for name, field, field_kind in plan.nested:
+                raw_key = graham.core.raw_key(data, name, field)
+                value = data.get(raw_key)
+                if value is None:
+                    continue
+
+                if field_kind == NESTED and not field.schema.many:
+                    schemas = _child_schemas(field, field_kind, value)
+                elif _is_collection(value):
+                    value = list(value)
+                    schemas = _child_schemas(field, field_kind, value)
+                else:
+                    schemas = None
+
+                if schemas is None:
+                    if field_kind == MIXED:
+                        raise marshmallow.ValidationError(
+                            {raw_key: ['Invalid type.']},
+                            data=data,
+                        )
+                    try:
+                        data[raw_key] = field.deserialize(value, raw_key, data)
+                    except marshmallow.ValidationError as e:
+                        raise marshmallow.ValidationError(
+                            {raw_key: e.messages},
+                            data=data,
+                        )
+                    continue
+
+                path = frame.path + (raw_key,)
+
+                element = skip_invalid and field_kind == MIXED
+                tolerated = element or frame.tolerated
+
+                if isinstance(schemas, list):
+                    values = [None] * len(value)
+                    data[raw_key] = values
+                    children.extend(
+                        _Frame(
+                            action=_enter,
+                            schema=nested,
+                            data=item,
+                            target=values,
+                            key=index,
+                            identifier=missing,
+                            path=path + (index,),
+                            element=element,
+                            tolerated=tolerated,
+                        )
+                        for index, (nested, item) in enumerate(
+                            zip(schemas, value),
+                        )
+                    )
+                else:
+                    children.append(_Frame(
+                        action=_enter,
+                        schema=schemas,
+                        data=value,
+                        target=data,
+                        key=raw_key,
+                        identifier=missing,
+                        path=path,
+                        element=element,
+                        tolerated=tolerated,
+                    ))
+
+            frame = frame._replace(
+                action=_exit,
+                schema=plan,
+                data=data,
+                identifier=identifier,
+            )
+            if not children:
+                # nothing to wait for so the object is completed right away
+                complete(frame)
+                continue
+
+            stack.append(frame)
+            stack.extend(reversed(children))
+        except marshmallow.ValidationError as e:
+            if policy is None:
+                raise marshmallow.ValidationError(
+                    _nest(frame.path, e.messages),
+                    data=e.data,
+                )
+
+            target[key] = _skipped if frame.element else _failed
+            record(frame.path, e.messages, frame.tolerated)
+
+    if report is not None and report.failures > 0:
+        raise report.error()
+
+    for instance, attribute in fixups:
+        value = getattr(instance, attribute)
+        if isinstance(value, list):
+            value[:] = [_resolve(objects, each) for each in value]
+        elif isinstance(value, tuple):
+            value = tuple(_resolve(objects, each) for each in value)
+        else:
+            value = _resolve(objects, value)
+        # bypass frozen classes, the instance is still being built
+        object.__setattr__(instance, attribute, value)
+
+    for instance in deferred:
+        done_method = type(graham.core.schema(instance)).done_method
+        if done_method is not None:
+            done_method(instance)
+
+    return _resolve(objects, root[0])
+
+
+def dumps(instance, *args, **kwargs):
+    # references is taken from kwargs so that positional arguments can be
+    # passed on to the JSON module
+    references = kwargs.pop('references', False)
+
+    schema = graham.core.schema(instance)
+    return schema.opts.json_module.dumps(
+        dump(instance, references=references),
+        *args,
+        **kwargs
+    )
+
+
+def loads(cls, serialized, *args, **kwargs):
+    references = kwargs.pop('references', False)
+    policy = kwargs.pop('policy', None)
+    report = kwargs.pop('report', None)
+
+    schema = graham.core.schema(cls)
+    return load(
+        cls,
+        schema.opts.json_module.loads(serialized, *args, **kwargs),
+        references=references,
+        policy=policy,
+        report=report,
+    )
@@ -0,0 +1,44 @@
+import json
+
+import graham.core
+import graham.iterative
+
+
+# Newline delimited JSON, one tagged object per line.  The class of each
+# line is only known once it has been parsed so, unlike graham.dumps(), the
+# JSON module is passed in rather than taken from the schema.
+
+
+def iter_load(fp, json_module=json):
+    for line in fp:
+        line = line.strip()
+        if not line:
+            continue
+
+        data = json_module.loads(line)
+        cls = graham.core.lookup(data)
+
+        yield graham.iterative.load(cls, data)
+
+
+def dump_iter(iterable, fp, buffer_size=2**16, json_module=json):
+    lines = []
+    size = 0
+    count = 0
+
+    for instance in iterable:
+        line = json_module.dumps(graham.iterative.dump(instance))
+        lines.append(line)
+        lines.append('\n')
+        size += len(line) + 1
+        count += 1
+
+        if size >= buffer_size:
+            fp.write(''.join(lines))
+            lines = []
+            size = 0
+
+    if lines:
+        fp.write(''.join(lines))
+
+    return count
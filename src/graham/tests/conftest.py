@@ -0,0 +1,11 @@
+import pytest
+
+import graham.core
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    # classes defined within a test are registered for its duration only
+    saved = graham.core.registry
+    yield
+    graham.core.registry = saved
@@ -0,0 +1,189 @@
+import hashlib
+import json
+
+import attr
+import marshmallow
+
+import graham
+import graham.canonical
+from graham.tests.test_overall import Group, Leaf
+
+
+@graham.schemify(tag='frozen_leaf')
+@attr.s(frozen=True)
+class FrozenLeaf(object):
+    value = attr.ib(metadata=graham.create_metadata(
+        field=marshmallow.fields.Integer(),
+    ))
+
+
+@graham.schemify(tag='frozen_node')
+@attr.s(frozen=True)
+class FrozenNode(object):
+    name = attr.ib(metadata=graham.create_metadata(
+        field=marshmallow.fields.String(),
+    ))
+    leaves = attr.ib(metadata=graham.create_metadata(
+        field=graham.fields.Tuple(
+            marshmallow.fields.Nested(graham.schema(FrozenLeaf)),
+        ),
+    ))
+    children = attr.ib(
+        default=(),
+        metadata=graham.create_metadata(
+            field=marshmallow.fields.Nested('self', many=True),
+        ),
+    )
+
+
+def build_frozen():
+    return FrozenNode(
+        name='root',
+        leaves=(FrozenLeaf(value=1),),
+        children=tuple(
+            FrozenNode(
+                name=str(i),
+                leaves=tuple(FrozenLeaf(value=j) for j in range(3)),
+            )
+            for i in range(3)
+        ),
+    )
+
+
+def test_dumps():
+    group = Group(name='ünicode', leaves=[Leaf(name='leaf')])
+
+    dumped = graham.canonical.dumps(group)
+
+    assert ' ' not in dumped
+    assert all(ord(c) < 128 for c in dumped)
+    assert dumped == json.dumps(
+        json.loads(graham.dumps(group).data),
+        sort_keys=True,
+        separators=(',', ':'),
+    )
+
+
+def test_content_hash():
+    group = Group(name='group', leaves=[Leaf(name='leaf')])
+
+    digest = graham.content_hash(group)
+
+    assert digest == graham.content_hash(
+        Group(name='group', leaves=[Leaf(name='leaf')]),
+    )
+    assert len(digest) == hashlib.sha256().digest_size * 2
+    assert graham.content_hash(group, algorithm='md5') != digest
+
+    group.leaves[0].name = 'changed'
+    assert graham.content_hash(group) != digest
+
+    assert not hasattr(group, graham.canonical._cache_attribute)
+
+
+def test_content_hash_structure():
+    leaf = Leaf(name='leaf')
+    group = Group(name='group', leaves=[leaf])
+
+    leaf_data = graham.core.dump(leaf).data
+    leaf_digest = hashlib.sha256(
+        graham.canonical.encoder.encode(leaf_data).encode('ascii'),
+    ).hexdigest()
+
+    group_data = graham.core.dump(group).data
+    group_data['leaves'] = [
+        {graham.canonical.hash_attribute_name: leaf_digest},
+    ]
+    group_digest = hashlib.sha256(
+        graham.canonical.encoder.encode(group_data).encode('ascii'),
+    ).hexdigest()
+
+    assert graham.content_hash(group) == group_digest
+
+
+def test_frozen_cache(monkeypatch):
+    digests = []
+    digest = graham.canonical._digest
+
+    def counting_digest(algorithm, data):
+        digests.append(data)
+        return digest(algorithm, data)
+
+    monkeypatch.setattr(graham.canonical, '_digest', counting_digest)
+
+    tree = build_frozen()
+    first = graham.content_hash(tree)
+
+    # 4 nodes and 10 leaves
+    assert len(digests) == 14
+    assert graham.content_hash(tree) == first
+    assert len(digests) == 14
+
+    changed = attr.evolve(
+        tree,
+        children=tree.children[:2] + (
+            attr.evolve(tree.children[2], name='changed'),
+        ),
+    )
+    del digests[:]
+    second = graham.content_hash(changed)
+
+    # only the replaced node and the new root
+    assert len(digests) == 2
+    assert second != first
+
+    monkeypatch.setattr(graham.canonical, '_digest', digest)
+    fresh = FrozenNode(
+        name='root',
+        leaves=(FrozenLeaf(value=1),),
+        children=tuple(
+            FrozenNode(
+                name=str(i) if i < 2 else 'changed',
+                leaves=tuple(FrozenLeaf(value=j) for j in range(3)),
+            )
+            for i in range(3)
+        ),
+    )
+    assert graham.content_hash(fresh) == second
+
+
+def test_frozen_mutable_values():
+    @graham.schemify(tag='frozen_values')
+    @attr.s(frozen=True)
+    class FrozenValues(object):
+        values = attr.ib(metadata=graham.create_metadata(
+            field=marshmallow.fields.List(marshmallow.fields.Integer()),
+        ))
+        meta = attr.ib(metadata=graham.create_metadata(
+            field=marshmallow.fields.Dict(),
+        ))
+
+    values = FrozenValues(values=[1, 2], meta={'a': 1})
+    first = graham.content_hash(values)
+
+    values.values.append(3)
+    values.meta['b'] = 2
+
+    assert graham.content_hash(values) != first
+    assert graham.content_hash(values) == graham.content_hash(
+        FrozenValues(values=[1, 2, 3], meta={'a': 1, 'b': 2}),
+    )
+    assert not hasattr(values, graham.canonical._cache_attribute)
+
+
+def test_frozen_detection():
+    @attr.s(frozen=True)
+    class Base(object):
+        pass
+
+    class Derived(Base):
+        pass
+
+    leaf = Leaf()
+    before = dict(vars(leaf))
+
+    assert graham.core.is_frozen(FrozenLeaf(value=1))
+    assert graham.core.is_frozen(Derived())
+    assert not graham.core.is_frozen(leaf)
+    assert not graham.core.is_frozen(object())
+    assert vars(leaf) == before
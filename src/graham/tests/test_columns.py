@@ -0,0 +1,90 @@
+import json
+
+import attr
+import marshmallow
+import pytest
+
+import graham
+import graham.columns
+from graham.tests.test_overall import Group, Leaf
+
+
+type_name = graham.core.type_attribute_name
+version_name = graham.core.version_attribute_name
+
+
+@graham.schemify(tag='sample', version='1')
+@attr.s
+class Sample(object):
+    time = attr.ib(metadata=graham.create_metadata(
+        field=marshmallow.fields.Float(),
+    ))
+    value = attr.ib(metadata=graham.create_metadata(
+        field=marshmallow.fields.Integer(dump_to='v', load_from='v'),
+    ))
+    note = attr.ib(default=None)
+
+
+def test_round_trip():
+    samples = [Sample(time=t / 10, value=t * t) for t in range(100)]
+
+    dumped = graham.dump_columns(samples)
+
+    assert list(dumped.keys()) == [type_name, version_name, 'columns']
+    assert dumped[type_name] == 'sample'
+    assert dumped[version_name] == '1'
+    assert dumped['columns'] == {
+        'time': [sample.time for sample in samples],
+        'v': [sample.value for sample in samples],
+    }
+
+    rows = json.dumps([graham.core.dump(sample).data for sample in samples])
+    assert len(json.dumps(dumped)) < len(rows)
+
+    assert graham.load_columns(json.loads(json.dumps(dumped))) == samples
+
+
+def test_sorted():
+    samples = [Sample(time=t, value=-t) for t in range(5)]
+
+    dumped = graham.dump_columns(samples, key=lambda sample: sample.value)
+
+    assert dumped['columns']['time'] == [4, 3, 2, 1, 0]
+
+
+def test_nested():
+    groups = [
+        Group(name='a', leaves=[Leaf(name='a leaf')]),
+        Group(name='b'),
+    ]
+
+    dumped = graham.dump_columns(groups)
+
+    assert dumped['columns']['leaves'] == [
+        [graham.core.dump(Leaf(name='a leaf')).data],
+        [],
+    ]
+    assert graham.load_columns(dumped) == groups
+
+
+def test_empty():
+    with pytest.raises(ValueError):
+        graham.dump_columns([])
+
+    dumped = graham.dump_columns([], cls=Sample)
+
+    assert dumped['columns'] == {'time': [], 'v': []}
+    assert graham.load_columns(dumped) == []
+
+
+def test_mixed_types():
+    with pytest.raises(graham.core.UnmatchedTypeError):
+        graham.dump_columns([Sample(time=0, value=0), Leaf()])
+
+
+def test_ragged():
+    dumped = graham.dump_columns([Sample(time=0, value=0)])
+    dumped['columns']['v'].append(1)
+
+    with pytest.raises(marshmallow.ValidationError, match='length'):
+        graham.load_columns(dumped)
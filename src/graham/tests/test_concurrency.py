@@ -0,0 +1,130 @@
+import json
+import sys
+import threading
+
+import attr
+import marshmallow
+
+import graham
+import graham.fields
+import graham.iterative
+
+
+thread_count = 8
+iterations = 50
+
+
+def create_classes():
+    @graham.schemify(tag='stress_leaf', version='1')
+    @attr.s
+    class Leaf(object):
+        name = attr.ib(metadata=graham.create_metadata(
+            field=marshmallow.fields.String(),
+        ))
+
+    @graham.schemify(tag='stress_group', version='1')
+    @attr.s
+    class Group(object):
+        name = attr.ib(metadata=graham.create_metadata(
+            field=marshmallow.fields.String(),
+        ))
+        children = attr.ib(
+            default=attr.Factory(list),
+            metadata=graham.create_metadata(
+                field=graham.fields.MixedList(fields=(
+                    marshmallow.fields.Nested('self'),
+                    marshmallow.fields.Nested(graham.schema(Leaf)),
+                )),
+            ),
+        )
+
+    return Group, Leaf
+
+
+def build(Group, Leaf, depth, name):
+    group = Group(name=name)
+    group.children.append(Leaf(name=name + ' leaf'))
+    if depth > 0:
+        group.children.append(build(Group, Leaf, depth - 1, name + '.0'))
+        group.children.append(build(Group, Leaf, depth - 1, name + '.1'))
+
+    return group
+
+
+def run_threads(target):
+    barrier = threading.Barrier(thread_count)
+    errors = []
+    results = [None] * thread_count
+
+    def run(index):
+        try:
+            barrier.wait()
+            results[index] = target(index)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=run, args=(index,))
+        for index in range(thread_count)
+    ]
+    # switch threads often to shake out races
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert errors == []
+
+    return results
+
+
+def test_concurrent_dump_load():
+    # fresh classes so that first use caching also happens concurrently
+    Group, Leaf = create_classes()
+    group = build(Group, Leaf, depth=4, name='root')
+
+    def target(index):
+        results = []
+        for _ in range(iterations):
+            serialized = graham.dumps(group).data
+            loaded = graham.schema(Group).loads(serialized).data
+            dumped = graham.iterative.dump(group)
+            reloaded = graham.iterative.load(Group, dumped)
+            results.append((serialized, loaded, dumped, reloaded))
+
+        return results
+
+    results = run_threads(target)
+
+    expected = graham.dumps(group).data
+    for thread_results in results:
+        for serialized, loaded, dumped, reloaded in thread_results:
+            assert serialized == expected
+            assert json.loads(serialized) == dumped
+            assert loaded == group
+            assert reloaded == group
+
+
+def test_concurrent_registration():
+    def target(index):
+        @graham.schemify(tag='stress_registered', version=str(index))
+        @attr.s
+        class Test(object):
+            pass
+
+        found = []
+        for _ in range(iterations):
+            found.append(graham.lookup({
+                graham.core.type_attribute_name: 'stress_registered',
+                graham.core.version_attribute_name: str(index),
+            }))
+
+        return Test, found
+
+    for cls, found in run_threads(target):
+        assert all(each is cls for each in found)
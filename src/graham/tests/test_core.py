@@ -1,4 +1,6 @@
+import gc
 import textwrap
+import warnings
 
 import attr
 import marshmallow
@@ -259,3 +261,115 @@ def test_done():
     result, = result
 
     assert result == expected
+
+
+@pytest.mark.parametrize('style', ['static', 'class', 'instance'])
+def test_done_styles(style):
+    result = []
+
+    def hook(*args):
+        result.append(len(args))
+
+    class Base(object):
+        if style == 'static':
+            done = staticmethod(hook)
+        elif style == 'class':
+            done = classmethod(hook)
+        else:
+            def __attrs_post_init__(self):
+                self.done = hook
+
+    @graham.schemify(tag='test', done='done')
+    @attr.s
+    class Test(Base):
+        a = attr.ib()
+        graham.attrib(
+            attribute=a,
+            field=marshmallow.fields.Integer()
+        )
+
+    graham.schema(Test).load({type_name: 'test', 'a': 1})
+
+    assert result == [1 if style == 'class' else 0]
+
+
+def test_preload():
+    @graham.schemify(tag='test')
+    @attr.s
+    class Test(object):
+        test = attr.ib()
+        graham.attrib(
+            attribute=test,
+            field=marshmallow.fields.String(),
+        )
+
+    serialized = '{{"{}": "test", "test": "test"}}'.format(type_name)
+
+    enabled = gc.isenabled()
+    frozen = getattr(gc, 'get_freeze_count', lambda: 0)()
+    loaded = graham.preload(Test, serialized).data
+    assert gc.isenabled() == enabled
+    assert getattr(gc, 'get_freeze_count', lambda: 0)() == frozen
+
+    assert loaded == Test(test='test')
+
+
+def test_preload_freeze():
+    @graham.schemify(tag='test')
+    @attr.s
+    class Test(object):
+        test = attr.ib()
+        graham.attrib(
+            attribute=test,
+            field=marshmallow.fields.String(),
+        )
+
+    serialized = '{{"{}": "test", "test": "test"}}'.format(type_name)
+
+    enabled = gc.isenabled()
+    try:
+        loaded = graham.preload(Test, serialized, freeze=True).data
+        assert gc.isenabled() == enabled
+        if hasattr(gc, 'get_freeze_count'):
+            assert gc.get_freeze_count() > 0
+    finally:
+        if hasattr(gc, 'unfreeze'):
+            gc.unfreeze()
+
+    assert loaded == Test(test='test')
+
+
+def test_private_attribute():
+    @graham.schemify(tag='test', version='1')
+    @attr.s
+    class Test(object):
+        _private = attr.ib()
+        graham.attrib(
+            attribute=_private,
+            field=marshmallow.fields.String(),
+        )
+
+    test = Test(private='secret')
+
+    serialized = graham.dumps(test).data
+    assert graham.schema(Test).loads(serialized).data == test
+
+
+def test_register_duplicate():
+    def create():
+        @graham.schemify(tag='duplicate', version='1')
+        @attr.s
+        class Test(object):
+            pass
+
+        return Test
+
+    first = create()
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        graham.core.register_type(first)
+
+    with pytest.warns(graham.core.DuplicateTypeWarning):
+        second = create()
+
+    assert graham.lookup({type_name: 'duplicate', version_name: '1'}) is second
@@ -0,0 +1,96 @@
+import gzip
+import json
+import sys
+
+import pytest
+
+import graham
+import graham.files
+from graham.tests.test_overall import Group, Leaf
+
+
+def build_group():
+    group = Group(name='archived')
+    group.groups.append(Group(name='subgroup', leaves=[Leaf(name='leaf')]))
+    group.mixed_list.append(Leaf(name='mixed list leaf'))
+
+    return group
+
+
+@pytest.mark.parametrize(
+    'extension, module',
+    (
+        ('.json', None),
+        ('.json.gz', None),
+        ('.json.bz2', None),
+        ('.json.xz', None),
+        ('.json.zst', 'zstandard'),
+        ('.json.lz4', 'lz4.frame'),
+    ),
+)
+def test_round_trip(tmpdir, extension, module):
+    if module is not None:
+        pytest.importorskip(module)
+
+    path = str(tmpdir.join('group' + extension))
+    group = build_group()
+
+    graham.dump_file(group, path)
+
+    with open(path, 'rb') as f:
+        start = f.read(1)
+    assert (start == b'{') == (extension == '.json')
+
+    assert graham.load_file(path) == group
+    assert graham.load_file(path, cls=Group) == group
+
+
+def test_magic(tmpdir):
+    path = str(tmpdir.join('group.json'))
+    group = build_group()
+
+    with gzip.open(path, 'wt') as f:
+        f.write(graham.dumps(group).data)
+
+    assert graham.load_file(path) == group
+
+
+def test_explicit_compression(tmpdir):
+    path = str(tmpdir.join('group'))
+    group = build_group()
+
+    graham.dump_file(group, path, compression='gzip')
+
+    with gzip.open(path, 'rt') as f:
+        assert json.load(f) == json.loads(graham.dumps(group).data)
+
+
+def test_unknown_compression(tmpdir):
+    path = str(tmpdir.join('group'))
+
+    with pytest.raises(graham.files.UnknownCompressionError):
+        graham.dump_file(build_group(), path, compression='nope')
+
+
+@pytest.mark.parametrize('module, compression', [
+    ('bz2', 'bz2'),
+    ('lzma', 'xz'),
+])
+def test_unavailable_codec(tmpdir, monkeypatch, module, compression):
+    # a None entry makes the import fail as if the module didn't exist
+    monkeypatch.setitem(sys.modules, module, None)
+    path = str(tmpdir.join('group'))
+
+    with pytest.raises(graham.files.UnknownCompressionError):
+        graham.dump_file(build_group(), path, compression=compression)
+
+
+def test_stream_lines(tmpdir):
+    path = str(tmpdir.join('leaves.ndjson.gz'))
+    leaves = [Leaf(name=str(i)) for i in range(10)]
+
+    with graham.files.open_file(path, 'w') as f:
+        graham.dump_iter(leaves, f)
+
+    with graham.files.open_file(path) as f:
+        assert list(graham.iter_load(f)) == leaves
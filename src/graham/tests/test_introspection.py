@@ -0,0 +1,112 @@
+import attr
+import marshmallow
+
+import graham
+import graham.iterative
+from graham.tests.test_overall import Group, Leaf
+
+
+def test_describe():
+    description = graham.describe(Group)
+
+    assert description.cls is Group
+    assert description.tag == 'group'
+    assert description.version == Group.__graham_graham__.version
+    assert [field.name for field in description.fields] == [
+        graham.core.type_attribute_name,
+        graham.core.version_attribute_name,
+        'name',
+        'groups',
+        'leaves',
+        'mixed_list',
+    ]
+    assert [field.kind for field in description.fields] == [
+        None,
+        None,
+        None,
+        graham.iterative.NESTED,
+        graham.iterative.LIST,
+        graham.iterative.MIXED,
+    ]
+    assert description.skipped == ()
+    assert description.done is None
+    assert description.done_method is None
+    assert description.processors == (('post_load', 'deserialize'),)
+    assert description.registered
+    assert description.class_registered
+    assert description.fast_dump
+    assert description.fast_load
+    assert description.code is None
+
+    assert not graham.describe(Leaf).class_registered
+
+
+def test_describe_details():
+    @graham.schemify(tag='described', done='finish')
+    @attr.s
+    class Test(object):
+        a = attr.ib(metadata=graham.create_metadata(
+            field=marshmallow.fields.Integer(
+                required=True,
+                dump_to='b',
+                load_from='c',
+            ),
+        ))
+        cache = attr.ib(default=None)
+
+        def finish(self):
+            pass
+
+    description = graham.describe(Test, code=True)
+
+    field = description.fields[-1]
+    assert (field.name, field.dump_key, field.load_key, field.required) == (
+        'a',
+        'b',
+        'c',
+        True,
+    )
+    assert description.skipped == ('cache',)
+    assert description.done == 'finish'
+    assert description.done_method is Test.finish
+    assert 'def validate(d):' in description.code
+
+    formatted = description.format()
+    assert "a: Integer, required, dump to 'b', load from 'c'" in formatted
+    assert 'skipped: cache' in formatted
+    assert 'done: finish ({}.finish)\n'.format(
+        graham.core._qualified_name(Test),
+    ) in formatted
+    assert 'generated validator:' in formatted
+
+
+def test_describe_done_per_object():
+    @graham.schemify(tag='described', done='finish')
+    @attr.s
+    class Test(object):
+        @staticmethod
+        def finish():
+            pass
+
+    description = graham.describe(Test)
+
+    assert isinstance(description.done_method, graham.core.DoneLookup)
+    assert description.done_method.name == 'finish'
+    assert 'done: finish (looked up per object)\n' in description.format()
+
+
+def test_describe_slow_path():
+    @graham.schemify(tag='slow')
+    @attr.s
+    class Test(object):
+        pass
+
+    Test.__graham_graham__.schema.__processors__[
+        ('pre_load', False)
+    ] = ['deserialize']
+
+    description = graham.describe(Test)
+
+    assert description.fast_dump
+    assert not description.fast_load
+    assert 'load path: marshmallow' in description.format()
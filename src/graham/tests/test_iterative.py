@@ -0,0 +1,425 @@
+import json
+import sys
+import threading
+
+import attr
+import marshmallow
+import pytest
+
+import graham
+import graham.iterative
+from graham.tests.test_overall import Group, Leaf
+
+
+type_name = graham.core.type_attribute_name
+version_name = graham.core.version_attribute_name
+
+
+def build_example():
+    subgroup = Group(name='subgroup')
+    subgroup.leaves.append(Leaf(name='subgroup leaf'))
+
+    group = Group()
+    group.groups.append(subgroup)
+    group.leaves.append(Leaf())
+    group.mixed_list.append(Leaf(name='mixed list leaf'))
+    group.mixed_list.append(Group(name='mixed list group'))
+
+    return group
+
+
+def build_deep(depth):
+    root = Group(name='0')
+    group = root
+    for i in range(1, depth):
+        child = Group(name=str(i))
+        child.leaves.append(Leaf(name=str(i)))
+        if i % 2:
+            group.groups.append(child)
+        else:
+            group.mixed_list.append(child)
+        group = child
+
+    return root
+
+
+def test_dump_matches():
+    group = build_example()
+
+    expected = graham.core.dump(group).data
+    dumped = graham.iterative.dump(group)
+
+    assert dumped == expected
+    assert json.dumps(dumped) == json.dumps(expected)
+
+
+def test_load_matches():
+    group = build_example()
+    data = json.loads(graham.dumps(group).data)
+
+    assert graham.iterative.load(Group, data) == group
+
+
+def test_deep():
+    depth = sys.getrecursionlimit() * 2
+
+    dumped = graham.iterative.dump(build_deep(depth))
+    loaded = graham.iterative.load(Group, dumped)
+
+    names = []
+    group = loaded
+    while group is not None:
+        names.append(group.name)
+        children = group.groups + group.mixed_list
+        group = children[0] if children else None
+
+    assert names == [str(i) for i in range(depth)]
+
+
+def test_deep_strings():
+    # the standard library json module recurses, see the module comment.
+    # RecursionError, a RuntimeError, is only available from Python 3.5.
+    deep = build_deep(sys.getrecursionlimit() * 2)
+
+    with pytest.raises(RuntimeError):
+        graham.iterative.dumps(deep)
+
+    shallow = build_deep(10)
+    serialized = graham.iterative.dumps(shallow, indent=2, references=True)
+
+    assert '\n  ' in serialized
+    assert graham.iterative.loads(Group, serialized, references=True) == (
+        shallow
+    )
+
+
+def test_tuple():
+    @graham.schemify(tag='test')
+    @attr.s
+    class Test(object):
+        leaves = attr.ib()
+        graham.attrib(
+            attribute=leaves,
+            field=graham.fields.Tuple(
+                marshmallow.fields.Nested(graham.schema(Leaf)),
+            ),
+        )
+
+    test = Test(leaves=(Leaf(name='a'), Leaf(name='b')))
+
+    dumped = graham.iterative.dump(test)
+    assert dumped == graham.core.dump(test).data
+    assert graham.iterative.load(Test, dumped) == test
+
+
+def test_load_invalid():
+    data = graham.iterative.dump(build_example())
+    data['groups'][0]['leaves'][0]['name'] = 37
+
+    with pytest.raises(marshmallow.ValidationError) as info:
+        graham.iterative.load(Group, data)
+
+    with pytest.raises(marshmallow.ValidationError) as expected:
+        graham.schema(Group).load(data)
+
+    assert info.value.messages == expected.value.messages
+
+    data['groups'] = 'not a list'
+
+    with pytest.raises(marshmallow.ValidationError, match='groups'):
+        graham.iterative.load(Group, data)
+
+
+def test_references_shared():
+    leaf = Leaf(name='shared')
+    groups = [Group(name=str(i), leaves=[leaf]) for i in range(3)]
+    group = Group(groups=groups, mixed_list=[leaf])
+
+    dumped = graham.iterative.dump(group, references=True)
+
+    reference = {graham.iterative.reference_attribute_name: 0}
+    assert dumped['groups'][0]['leaves'][0] == {
+        graham.iterative.id_attribute_name: 0,
+        type_name: 'leaf',
+        version_name: graham.core.schema(Leaf).fields[version_name].default,
+        'name': 'shared',
+    }
+    assert dumped['groups'][1]['leaves'] == [reference]
+    assert dumped['groups'][2]['leaves'] == [reference]
+    assert dumped['mixed_list'] == [reference]
+
+    serialized = graham.iterative.dumps(group, references=True)
+    assert len(serialized) < len(graham.dumps(group).data)
+
+    loaded = graham.iterative.loads(Group, serialized, references=True)
+    assert loaded == group
+
+    loaded_leaf = loaded.groups[0].leaves[0]
+    assert all(g.leaves[0] is loaded_leaf for g in loaded.groups)
+    assert loaded.mixed_list[0] is loaded_leaf
+
+
+def test_references_cycle():
+    group = Group(name='cycle')
+    subgroup = Group(name='sub')
+    subgroup.mixed_list.append(group)
+    group.groups.append(subgroup)
+    group.mixed_list.append(group)
+
+    dumped = graham.iterative.dump(group, references=True)
+
+    assert dumped[graham.iterative.id_attribute_name] == 0
+    assert dumped['mixed_list'] == [
+        {graham.iterative.reference_attribute_name: 0},
+    ]
+
+    loaded = graham.iterative.load(Group, dumped, references=True)
+
+    assert loaded.name == 'cycle'
+    assert loaded.mixed_list[0] is loaded
+    assert loaded.groups[0].name == 'sub'
+    assert loaded.groups[0].mixed_list[0] is loaded
+
+
+def test_references_cycle_hooks():
+    seen = []
+
+    @graham.schemify(tag='node', done='check')
+    @attr.s
+    class Node(object):
+        name = attr.ib()
+        graham.attrib(
+            attribute=name,
+            field=marshmallow.fields.String(),
+        )
+
+        children = attr.ib(
+            default=attr.Factory(list),
+            validator=lambda instance, attribute, value: seen.extend(
+                type(each).__name__ for each in value
+            ),
+        )
+        graham.attrib(
+            attribute=children,
+            field=marshmallow.fields.Nested('self', many=True),
+        )
+
+        def check(self):
+            assert all(isinstance(each, Node) for each in self.children)
+            self.checked = True
+
+    first = Node(name='first')
+    second = Node(name='second', children=[first])
+    first.children.append(second)
+    del seen[:]
+
+    dumped = graham.iterative.dump(first, references=True)
+    loaded = graham.iterative.load(Node, dumped, references=True)
+
+    assert loaded.children[0].children[0] is loaded
+    assert loaded.checked
+    assert loaded.children[0].checked
+    # validators run in __init__() and so see the placeholder
+    assert seen == ['Reference', 'Node']
+
+
+def test_references_unresolved():
+    dumped = graham.iterative.dump(Group(groups=[Group()]))
+    dumped['groups'][0] = {graham.iterative.reference_attribute_name: 7}
+
+    with pytest.raises(marshmallow.ValidationError, match='7'):
+        graham.iterative.load(Group, dumped, references=True)
+
+
+def build_dirty():
+    data = graham.iterative.dump(build_example())
+    data['groups'][0]['leaves'][0]['name'] = 1
+    data['leaves'][0]['name'] = 2
+    data['mixed_list'][0]['name'] = 3
+    data['mixed_list'][1]['leaves'] = [{type_name: 'leaf', 'name': 4}]
+
+    return data
+
+
+def test_policy_fail_fast():
+    policy = graham.iterative.ErrorPolicy(max_errors=1)
+
+    with pytest.raises(marshmallow.ValidationError) as info:
+        graham.iterative.load(Group, build_dirty(), policy=policy)
+
+    report = info.value.report
+    assert len(report.errors) == 1
+    assert list(info.value.messages.keys()) == [
+        graham.iterative.format_path(report.errors[0].path),
+    ]
+
+
+def test_policy_collect():
+    policy = graham.iterative.ErrorPolicy()
+
+    with pytest.raises(marshmallow.ValidationError) as info:
+        graham.iterative.load(Group, build_dirty(), policy=policy)
+
+    report = info.value.report
+    assert sorted(error.path for error in report.errors) == [
+        ('groups', 0, 'leaves', 0),
+        ('leaves', 0),
+        ('mixed_list', 0),
+        ('mixed_list', 1, 'leaves', 0),
+    ]
+    assert not any(error.skipped for error in report.errors)
+    assert set(info.value.messages.keys()) == {
+        'groups/0/leaves/0',
+        'leaves/0',
+        'mixed_list/0',
+        'mixed_list/1/leaves/0',
+    }
+    assert info.value.messages['leaves/0'] == {
+        'name': ['Not a valid string.'],
+    }
+
+
+def test_policy_collect_bounded():
+    policy = graham.iterative.ErrorPolicy(max_errors=2)
+
+    with pytest.raises(marshmallow.ValidationError) as info:
+        graham.iterative.load(Group, build_dirty(), policy=policy)
+
+    assert len(info.value.report.errors) == 2
+    assert len(info.value.messages) == 2
+
+
+def test_policy_reused():
+    policy = graham.iterative.ErrorPolicy(max_errors=10)
+
+    with pytest.raises(marshmallow.ValidationError) as info:
+        graham.iterative.load(Group, build_dirty(), policy=policy)
+
+    assert info.value.report.failures > 0
+
+    data = graham.iterative.dump(build_example())
+    report = graham.iterative.LoadReport()
+    loaded = graham.iterative.load(
+        Group,
+        data,
+        policy=policy,
+        report=report,
+    )
+
+    assert loaded == build_example()
+    assert report.errors == []
+    assert report.failures == 0
+
+
+def test_policy_immutable():
+    policy = graham.iterative.ErrorPolicy()
+
+    with pytest.raises(attr.exceptions.FrozenInstanceError):
+        policy.max_errors = 1
+
+
+def test_policy_shared_between_threads():
+    policy = graham.iterative.ErrorPolicy()
+    dirty = build_dirty()
+    clean = graham.iterative.dump(build_example())
+    results = [None] * 8
+
+    def run(index):
+        data = dirty if index % 2 else clean
+        report = graham.iterative.LoadReport()
+        try:
+            graham.iterative.load(Group, data, policy=policy, report=report)
+        except marshmallow.ValidationError:
+            pass
+        results[index] = report
+
+    threads = [
+        threading.Thread(target=run, args=(index,))
+        for index in range(len(results))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for index, report in enumerate(results):
+        assert (report.failures > 0) == bool(index % 2)
+
+
+def test_policy_skip_invalid():
+    data = graham.iterative.dump(build_example())
+    data['mixed_list'][0]['name'] = 3
+    data['mixed_list'][1]['leaves'] = [{type_name: 'leaf', 'name': 4}]
+    data['mixed_list'].append({type_name: 'leaf', version_name: 'nope'})
+    data['mixed_list'].append(graham.core.dump(Leaf(name='valid')).data)
+
+    policy = graham.iterative.ErrorPolicy(skip_invalid=True)
+    report = graham.iterative.LoadReport()
+    loaded = graham.iterative.load(
+        Group,
+        data,
+        policy=policy,
+        report=report,
+    )
+
+    expected = build_example()
+    expected.mixed_list = [Leaf(name='valid')]
+    assert loaded == expected
+
+    assert [error.path for error in report.errors] == [
+        ('mixed_list', 0),
+        ('mixed_list', 1, 'leaves', 0),
+        ('mixed_list', 2),
+    ]
+    assert all(error.skipped for error in report.errors)
+
+
+def test_policy_undispatched_elements():
+    data = graham.iterative.dump(build_example())
+    data['mixed_list'] = [
+        {type_name: 'bogus'},
+        'not a dict',
+        graham.core.dump(Leaf(name='valid')).data,
+    ]
+
+    policy = graham.iterative.ErrorPolicy(skip_invalid=True)
+    report = graham.iterative.LoadReport()
+    loaded = graham.iterative.load(
+        Group,
+        data,
+        policy=policy,
+        report=report,
+    )
+
+    assert loaded.mixed_list == [Leaf(name='valid')]
+    assert [error.path for error in report.errors] == [
+        ('mixed_list', 0),
+        ('mixed_list', 1),
+    ]
+    assert all(error.skipped for error in report.errors)
+    assert 'bogus' in str(report.errors[0].messages)
+
+    policy = graham.iterative.ErrorPolicy()
+    with pytest.raises(marshmallow.ValidationError) as info:
+        graham.iterative.load(Group, data, policy=policy)
+
+    assert set(info.value.messages.keys()) == {'mixed_list/0', 'mixed_list/1'}
+
+    with pytest.raises(marshmallow.ValidationError) as info:
+        graham.iterative.load(Group, data)
+
+    assert list(info.value.messages['mixed_list'].keys()) == [0]
+
+
+def test_policy_skip_invalid_still_fails():
+    data = build_dirty()
+
+    policy = graham.iterative.ErrorPolicy(skip_invalid=True)
+
+    with pytest.raises(marshmallow.ValidationError) as info:
+        graham.iterative.load(Group, data, policy=policy)
+
+    assert set(info.value.messages.keys()) == {
+        'groups/0/leaves/0',
+        'leaves/0',
+    }
@@ -0,0 +1,199 @@
+import attr
+import marshmallow
+import pytest
+
+import graham
+from graham.tests.test_overall import Group, Leaf
+
+
+def build():
+    return Group(
+        name='root',
+        groups=[
+            Group(name='first'),
+            Group(name='second', leaves=[Leaf(name='leaf')]),
+        ],
+        leaves=[Leaf(name='a'), Leaf(name='b')],
+    )
+
+
+def test_unchanged():
+    instance = build()
+    groups = instance.groups
+
+    changed = graham.reload(instance, graham.core.dump(instance).data)
+
+    assert changed == []
+    assert instance == build()
+    assert instance.groups is groups
+
+
+def test_in_place():
+    instance = build()
+    first, second = instance.groups
+    leaf = second.leaves[0]
+
+    data = graham.core.dump(instance).data
+    data['name'] = 'renamed'
+    data['groups'][1]['leaves'][0]['name'] = 'changed'
+
+    changed = graham.reload(instance, data)
+
+    assert changed == [('name',), ('groups', 1, 'leaves', 0, 'name')]
+    assert instance.name == 'renamed'
+    assert instance.groups == [first, second]
+    assert instance.groups[0] is first
+    assert instance.groups[1] is second
+    assert second.leaves[0] is leaf
+    assert leaf.name == 'changed'
+
+
+def test_added_and_removed_by_position():
+    instance = build()
+    groups = instance.groups
+    first, second = groups
+
+    data = graham.core.dump(instance).data
+    data['groups'].append(graham.core.dump(Group(name='new')).data)
+    data['groups'][1]['name'] = 'updated'
+    data['leaves'] = data['leaves'][:1]
+
+    changed = graham.reload(instance, data)
+
+    assert changed == [('groups',), ('leaves',), ('groups', 1, 'name')]
+    assert instance.groups is groups
+    assert instance.groups[:2] == [first, second]
+    assert instance.groups[0] is first
+    # matched by position so the existing group is updated in place
+    assert instance.groups[1] is second
+    assert second.name == 'updated'
+    assert instance.groups[2] == Group(name='new')
+    assert instance.leaves == [Leaf(name='a')]
+
+
+def test_by_key():
+    instance = build()
+    first, second = instance.groups
+
+    data = graham.core.dump(instance).data
+    data['groups'] = [
+        graham.core.dump(Group(name='third')).data,
+        data['groups'][1],
+        data['groups'][0],
+    ]
+
+    changed = graham.reload(instance, data, key='name')
+
+    assert changed == [('groups',)]
+    assert [group.name for group in instance.groups] == [
+        'third',
+        'second',
+        'first',
+    ]
+    assert instance.groups[1] is second
+    assert instance.groups[2] is first
+
+
+def test_mixed_list():
+    instance = build()
+    instance.mixed_list = [Leaf(name='x'), Group(name='y')]
+    leaf = instance.mixed_list[0]
+
+    data = graham.core.dump(instance).data
+    data['mixed_list'][0]['name'] = 'z'
+    data['mixed_list'][1] = graham.core.dump(Leaf(name='w')).data
+
+    changed = graham.reload(instance, data)
+
+    assert changed == [('mixed_list',), ('mixed_list', 0, 'name')]
+    assert instance.mixed_list[0] is leaf
+    assert instance.mixed_list == [Leaf(name='z'), Leaf(name='w')]
+
+
+def test_invalid_leaves_tree_untouched():
+    instance = build()
+
+    data = graham.core.dump(instance).data
+    data['name'] = 'renamed'
+    data['groups'][0]['name'] = 37
+
+    with pytest.raises(marshmallow.ValidationError):
+        graham.reload(instance, data)
+
+    assert instance == build()
+
+
+@graham.schemify(tag='frozen_kid', version='1')
+@attr.s(frozen=True)
+class FrozenKid(object):
+    a = attr.ib()
+    graham.attrib(
+        attribute=a,
+        field=marshmallow.fields.Integer(),
+    )
+
+
+@graham.schemify(tag='holder', version='1')
+@attr.s
+class Holder(object):
+    x = attr.ib(
+        converter=int,
+        validator=attr.validators.instance_of(int),
+    )
+    graham.attrib(
+        attribute=x,
+        field=marshmallow.fields.Raw(),
+    )
+
+    kids = attr.ib(default=attr.Factory(list))
+    graham.attrib(
+        attribute=kids,
+        field=marshmallow.fields.List(
+            marshmallow.fields.Nested(graham.schema(FrozenKid)),
+        ),
+    )
+
+
+def test_frozen():
+    kid = FrozenKid(a=1)
+    holder = Holder(x=1, kids=[kid, FrozenKid(a=2)])
+
+    data = graham.core.dump(holder).data
+    data['x'] = 2
+    data['kids'][1]['a'] = 3
+
+    changed = graham.reload(holder, data)
+
+    assert changed == [('x',), ('kids',)]
+    assert holder == Holder(x=2, kids=[FrozenKid(a=1), FrozenKid(a=3)])
+    # unchanged frozen objects are kept
+    assert holder.kids[0] is kid
+
+    with pytest.raises(TypeError, match='Frozen'):
+        graham.reload(kid, graham.core.dump(FrozenKid(a=4)).data)
+
+    assert kid == FrozenKid(a=1)
+
+
+def test_converters_and_validators():
+    holder = Holder(x=1)
+
+    data = graham.core.dump(holder).data
+    data['x'] = '2'
+
+    assert graham.reload(holder, data) == [('x',)]
+    assert holder.x == 2
+    assert graham.reload(holder, data) == []
+
+    data['x'] = 'three'
+    data['kids'] = [graham.core.dump(FrozenKid(a=3)).data]
+
+    with pytest.raises(ValueError):
+        graham.reload(holder, data)
+
+    assert holder == Holder(x=2)
+
+
+def test_unmatched_type():
+    with pytest.raises(graham.core.UnmatchedTypeError):
+        graham.reload(build(), graham.core.dump(Leaf()).data)
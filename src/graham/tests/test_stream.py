@@ -0,0 +1,85 @@
+import io
+import json
+
+import attr
+import marshmallow
+import pytest
+
+import graham
+from graham.tests.test_overall import Group, Leaf
+
+
+@graham.schemify(tag='event', version='1')
+@attr.s
+class Event(object):
+    value = attr.ib()
+    graham.attrib(
+        attribute=value,
+        field=marshmallow.fields.Integer(),
+    )
+
+
+def test_round_trip():
+    records = [
+        Event(value=1),
+        Leaf(name='leaf'),
+        Group(name='group', leaves=[Leaf(name='group leaf')]),
+        Event(value=2),
+    ]
+
+    fp = io.StringIO()
+    count = graham.dump_iter(iter(records), fp, buffer_size=10)
+
+    assert count == len(records)
+
+    lines = fp.getvalue().splitlines()
+    assert lines == [graham.dumps(record).data for record in records]
+
+    fp.seek(0)
+    loaded = graham.iter_load(fp)
+
+    assert next(loaded) == records[0]
+    assert list(loaded) == records[1:]
+
+
+def test_json_module():
+    calls = []
+
+    class Module(object):
+        @staticmethod
+        def dumps(obj):
+            calls.append('dumps')
+            return json.dumps(obj)
+
+        @staticmethod
+        def loads(s):
+            calls.append('loads')
+            return json.loads(s)
+
+    fp = io.StringIO()
+    graham.dump_iter([Event(value=1)], fp, json_module=Module)
+    fp.seek(0)
+    loaded = list(graham.iter_load(fp, json_module=Module))
+
+    assert loaded == [Event(value=1)]
+    assert calls == ['dumps', 'loads']
+
+
+def test_blank_lines():
+    serialized = '\n{}\n\n'.format(graham.dumps(Event(value=3)).data)
+
+    assert list(graham.iter_load(io.StringIO(serialized))) == [Event(value=3)]
+
+
+def test_unknown_type():
+    fp = io.StringIO('{"_type": "nope"}\n')
+
+    with pytest.raises(graham.core.UnmatchedTypeError, match='nope'):
+        list(graham.iter_load(fp))
+
+
+def test_unknown_version():
+    fp = io.StringIO('{"_type": "event", "_version": "2", "value": 1}\n')
+
+    with pytest.raises(graham.core.UnmatchedTypeError, match="'2'"):
+        list(graham.iter_load(fp))
@@ -0,0 +1,136 @@
+import http.server
+import os
+import socketserver
+import threading
+
+import click.testing
+import pytest
+
+import graham.cli.updategitignore
+
+
+etag = '"v1"'
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(
+            (self.path, self.headers.get('If-None-Match')),
+        )
+
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = '# topics: {}\n'.format(self.path.rsplit('/', 1)[-1])
+        body = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# http.server.ThreadingHTTPServer is only available from Python 3.7
+class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+@pytest.fixture
+def server():
+    server = Server(('127.0.0.1', 0), Handler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+def invoke(server, tmpdir, *args):
+    url = 'http://{}:{}/api/'.format(*server.server_address)
+    result = click.testing.CliRunner().invoke(
+        graham.cli.updategitignore.cli,
+        [
+            '--url', url,
+            '--cache-dir', str(tmpdir.join('cache')),
+        ] + list(args),
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0, result.output
+
+
+def write_target(tmpdir, name, topics):
+    tmpdir.join(name + '.io').write('\n'.join(topics) + '\n')
+    tmpdir.join(name + '.local').write('{}-local\n'.format(name))
+
+    return [
+        str(tmpdir.join(name + '.io')),
+        str(tmpdir.join(name + '.local')),
+        str(tmpdir.join(name)),
+    ]
+
+
+def test_single(server, tmpdir):
+    paths = write_target(tmpdir, 'a', ['python', 'pycharm'])
+
+    invoke(
+        server,
+        tmpdir,
+        '--topics', paths[0],
+        '--local', paths[1],
+        '--output', paths[2],
+    )
+
+    assert tmpdir.join('a').read() == (
+        '# Local\n\na-local\n\n# topics: python,pycharm\n'
+    )
+    assert server.requests == [('/api/python,pycharm', None)]
+
+
+def test_targets_and_cache(server, tmpdir):
+    targets = [
+        write_target(tmpdir, 'a', ['python']),
+        write_target(tmpdir, 'b', ['linux']),
+        write_target(tmpdir, 'c', ['python']),
+    ]
+    arguments = []
+    for target in targets:
+        arguments.append('--target')
+        arguments.extend(target)
+
+    invoke(server, tmpdir, *arguments)
+
+    assert sorted(server.requests) == [
+        ('/api/linux', None),
+        ('/api/python', None),
+    ]
+    assert tmpdir.join('b').read().endswith('# topics: linux\n')
+    assert tmpdir.join('c').read() == (
+        '# Local\n\nc-local\n\n# topics: python\n'
+    )
+
+    # fresh cache entries are used without a request
+    os.remove(str(tmpdir.join('a')))
+    invoke(server, tmpdir, *arguments)
+
+    assert len(server.requests) == 2
+    assert tmpdir.join('a').read().endswith('# topics: python\n')
+
+    # stale entries are revalidated
+    del server.requests[:]
+    invoke(server, tmpdir, '--ttl', '0', *arguments)
+
+    assert sorted(server.requests) == [
+        ('/api/linux', etag),
+        ('/api/python', etag),
+    ]
+    assert tmpdir.join('a').read().endswith('# topics: python\n')
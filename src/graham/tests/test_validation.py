@@ -0,0 +1,220 @@
+import json
+
+import attr
+import marshmallow
+import pytest
+
+import graham
+import graham.validation
+from graham.tests.test_overall import Group, Leaf
+
+
+type_name = graham.core.type_attribute_name
+version_name = graham.core.version_attribute_name
+
+
+def build_document():
+    group = Group(name='group')
+    group.groups.append(Group(name='subgroup', leaves=[Leaf(name='leaf')]))
+    group.mixed_list.append(Leaf(name='mixed list leaf'))
+    group.mixed_list.append(Group(name='mixed list group'))
+
+    return json.loads(graham.dumps(group).data)
+
+
+def test_json_schema():
+    schema = graham.json_schema(Group)
+
+    assert schema['$ref'] == '#/definitions/group'
+
+    group = schema['definitions']['group']
+    assert group['properties'][type_name] == {'const': 'group'}
+    assert group['properties']['name'] == {'type': 'string'}
+    assert group['properties']['groups'] == {
+        'type': 'array',
+        'items': {'$ref': '#/definitions/group'},
+    }
+    assert group['properties']['mixed_list']['items'] == {
+        'oneOf': [
+            {'$ref': '#/definitions/group'},
+            {'$ref': '#/definitions/leaf'},
+        ],
+    }
+    assert group['required'] == [type_name, version_name]
+
+    leaf = schema['definitions']['leaf']
+    assert leaf['properties'][version_name] == {
+        'const': graham.schema(Leaf).fields[version_name].default,
+    }
+
+
+def test_field_types():
+    @graham.schemify(tag='test')
+    @attr.s
+    class Test(object):
+        integer = attr.ib(metadata=graham.create_metadata(
+            field=marshmallow.fields.Integer(required=True),
+        ))
+        optional = attr.ib(metadata=graham.create_metadata(
+            field=marshmallow.fields.Float(allow_none=True),
+        ))
+        numbers = attr.ib(metadata=graham.create_metadata(
+            field=marshmallow.fields.List(marshmallow.fields.Integer()),
+        ))
+        email = attr.ib(metadata=graham.create_metadata(
+            field=marshmallow.fields.Email(load_from='mail'),
+        ))
+
+    properties = graham.json_schema(Test)['definitions']['test']['properties']
+
+    assert properties['integer'] == {'type': 'integer'}
+    assert properties['optional'] == {'type': ['number', 'null']}
+    assert properties['numbers'] == {
+        'type': 'array',
+        'items': {'type': 'integer'},
+    }
+    assert properties['mail'] == {'type': 'string', 'format': 'email'}
+
+    validate = graham.compile_validator(Test)
+
+    validate({type_name: 'test', 'integer': 1, 'optional': None})
+
+    with pytest.raises(graham.validation.InvalidDocument, match='required'):
+        validate({type_name: 'test'})
+
+    with pytest.raises(graham.validation.InvalidDocument, match='numbers'):
+        validate({type_name: 'test', 'integer': 1, 'numbers': [1, 'a']})
+
+    with pytest.raises(graham.validation.InvalidDocument, match='integer'):
+        validate({type_name: 'test', 'integer': True})
+
+
+def test_validator_accepts():
+    graham.compile_validator(Group)(build_document())
+
+
+@pytest.mark.parametrize(
+    'path, value',
+    (
+        ((type_name,), 'leaf'),
+        (('name',), 37),
+        (('groups',), {}),
+        (('groups', 0, 'leaves', 0, version_name), 'nope'),
+        (('mixed_list', 1, type_name), 'unknown'),
+        (('mixed_list', 0), []),
+    ),
+)
+def test_validator_rejects(path, value):
+    document = build_document()
+    target = document
+    for key in path[:-1]:
+        target = target[key]
+    target[path[-1]] = value
+
+    validate = graham.compile_validator(Group)
+
+    with pytest.raises(graham.validation.InvalidDocument) as info:
+        validate(document)
+
+    assert info.value.args[0][:len(path) - 1] == path[:-1]
+
+
+def test_validator_source():
+    validate = graham.compile_validator(Group)
+
+    assert 'def validate(d):' in validate.source
+
+
+def test_versions_and_subsets():
+    def create_point(version):
+        @graham.schemify(tag='point', version=version)
+        @attr.s
+        class Point(object):
+            x = attr.ib()
+            graham.attrib(
+                attribute=x,
+                field=marshmallow.fields.Integer(),
+            )
+
+            y = attr.ib(default=0)
+            graham.attrib(
+                attribute=y,
+                field=marshmallow.fields.Integer(),
+            )
+
+        return Point
+
+    PointV1 = create_point('1')
+    PointV2 = create_point('2')
+
+    @graham.schemify(tag='container', version='1')
+    @attr.s
+    class Container(object):
+        old = attr.ib()
+        graham.attrib(
+            attribute=old,
+            field=marshmallow.fields.Nested(graham.schema(PointV1)),
+        )
+
+        new = attr.ib()
+        graham.attrib(
+            attribute=new,
+            field=marshmallow.fields.Nested(graham.schema(PointV2)),
+        )
+
+        x_only = attr.ib()
+        graham.attrib(
+            attribute=x_only,
+            field=marshmallow.fields.Nested(
+                type(graham.schema(PointV2)),
+                only=(type_name, version_name, 'x'),
+            ),
+        )
+
+    schema = graham.json_schema(Container)
+    properties = schema['definitions']['container']['properties']
+
+    assert properties['old'] == {'$ref': '#/definitions/point'}
+    assert properties['new'] == {'$ref': '#/definitions/point-2'}
+    assert properties['x_only'] == {'$ref': '#/definitions/point-3'}
+    assert schema['definitions']['point-2']['properties'][version_name] == {
+        'const': '2',
+    }
+    assert 'y' not in schema['definitions']['point-3']['properties']
+
+    document = json.loads(graham.dumps(Container(
+        old=PointV1(x=1, y=2),
+        new=PointV2(x=3, y=4),
+        x_only=PointV2(x=5, y=6),
+    )).data)
+    assert 'y' not in document['x_only']
+
+    graham.compile_validator(Container)(document)
+
+    document['old'][version_name] = '2'
+    with pytest.raises(graham.validation.InvalidDocument):
+        graham.compile_validator(Container)(document)
+
+
+def test_nullable_untyped():
+    @graham.schemify(tag='test')
+    @attr.s
+    class Test(object):
+        raw = attr.ib(metadata=graham.create_metadata(
+            field=marshmallow.fields.Raw(allow_none=True),
+        ))
+        defaulted = attr.ib(metadata=graham.create_metadata(
+            field=marshmallow.fields.Raw(missing=None),
+        ))
+
+    properties = graham.json_schema(Test)['definitions']['test']['properties']
+
+    assert properties['raw'] == {}
+    assert properties['defaulted'] == {}
+
+    validate = graham.compile_validator(Test)
+
+    validate({type_name: 'test', 'raw': None, 'defaulted': [1]})
+    validate({type_name: 'test', 'raw': {'a': 1}})
+
+    assert graham.describe(Test, code=True).code is not None
@@ -0,0 +1,377 @@
+import collections
+
+import marshmallow
+
+import graham.core
+import graham.fields
+import graham.iterative
+
+
+# JSON Schema (draft 7) describing documents as graham dumps them, and a
+# validator compiled from it.  The compiled validator only checks document
+# structure so it can reject bad input well before a full marshmallow load.
+
+
+class InvalidDocument(Exception):
+    pass
+
+
+json_schema_uri = 'http://json-schema.org/draft-07/schema#'
+definitions_prefix = '#/definitions/'
+
+_field_types = (
+    (marshmallow.fields.Boolean, 'boolean'),
+    (marshmallow.fields.Integer, 'integer'),
+    (marshmallow.fields.Number, 'number'),
+    (marshmallow.fields.Dict, 'object'),
+    (marshmallow.fields.String, 'string'),
+    (marshmallow.fields.DateTime, 'string'),
+    (marshmallow.fields.Date, 'string'),
+    (marshmallow.fields.Time, 'string'),
+)
+
+_formats = (
+    (marshmallow.fields.DateTime, 'date-time'),
+    (marshmallow.fields.Date, 'date'),
+    (marshmallow.fields.Time, 'time'),
+    (marshmallow.fields.Email, 'email'),
+    (marshmallow.fields.Url, 'uri'),
+    (marshmallow.fields.UUID, 'uuid'),
+)
+
+
+def _tag(schema):
+    return schema.fields[graham.core.type_attribute_name].default
+
+
+def _identity(schema):
+    version = schema.fields.get(graham.core.version_attribute_name)
+    return (
+        _tag(schema),
+        None if version is None else version.default,
+        tuple(schema.fields),
+    )
+
+
+class _Definitions(object):
+    # Names a definition per distinct schema.  Versions of a tag and subsets
+    # of its fields, such as from Nested(only=...), each get their own.  The
+    # first is named by the bare tag and later ones get a numeric suffix.
+    def __init__(self):
+        self.names = {}
+        self.pending = []
+
+    def name(self, schema):
+        identity = _identity(schema)
+        name = self.names.get(identity)
+        if name is None:
+            tag = identity[0]
+            used = set(self.names.values())
+            name = tag
+            suffix = 1
+            while name in used:
+                suffix += 1
+                name = '{}-{}'.format(tag, suffix)
+            self.names[identity] = name
+            self.pending.append((name, schema))
+
+        return name
+
+    def reference(self, schema):
+        return {'$ref': definitions_prefix + self.name(schema)}
+
+
+def _nullable(field, node):
+    # an empty node already accepts anything, null included
+    if not field.allow_none or not node:
+        return node
+
+    if list(node.keys()) == ['type']:
+        return {'type': [node['type'], 'null']}
+
+    return {'anyOf': [node, {'type': 'null'}]}
+
+
+def _mixed_schemas(field):
+    schemas = []
+    for schema in field.dispatch().values():
+        if isinstance(schema, type):
+            schema = schema()
+        if isinstance(schema, marshmallow.Schema):
+            schemas.append(schema)
+
+    return schemas
+
+
+def _field_node(field, definitions):
+    field_kind = graham.iterative.kind(field)
+
+    if field_kind == graham.iterative.NESTED:
+        node = definitions.reference(field.schema)
+        if field.many or field.schema.many:
+            node = {'type': 'array', 'items': node}
+    elif field_kind == graham.iterative.LIST:
+        node = {
+            'type': 'array',
+            'items': definitions.reference(field.container.schema),
+        }
+    elif field_kind == graham.iterative.MIXED:
+        node = {
+            'type': 'array',
+            'items': {'oneOf': [
+                definitions.reference(schema)
+                for schema in _mixed_schemas(field)
+            ]},
+        }
+    elif isinstance(field, marshmallow.fields.List):
+        node = {
+            'type': 'array',
+            'items': _field_node(field.container, definitions),
+        }
+    else:
+        node = {}
+        for field_type, json_type in _field_types:
+            if isinstance(field, field_type):
+                if getattr(field, 'as_string', False):
+                    json_type = 'string'
+                node['type'] = json_type
+                break
+        for field_type, format in _formats:
+            if isinstance(field, field_type):
+                node['format'] = format
+                break
+
+    return _nullable(field, node)
+
+
+def _definition(schema, definitions):
+    properties = collections.OrderedDict()
+    required = []
+
+    for name, field in schema.fields.items():
+        if field.dump_only:
+            continue
+
+        key = field.load_from or name
+        if name in (
+                graham.core.type_attribute_name,
+                graham.core.version_attribute_name,
+        ):
+            properties[key] = {'const': field.default}
+        else:
+            properties[key] = _field_node(field, definitions)
+
+        if field.required:
+            required.append(key)
+
+    definition = collections.OrderedDict()
+    definition['type'] = 'object'
+    definition['properties'] = properties
+    if required:
+        definition['required'] = required
+
+    return definition
+
+
+def json_schema(cls):
+    definitions = _Definitions()
+    root = definitions.name(graham.core.schema(cls))
+
+    result_definitions = collections.OrderedDict()
+    while definitions.pending:
+        name, schema = definitions.pending.pop(0)
+        result_definitions[name] = _definition(schema, definitions)
+
+    result = collections.OrderedDict()
+    result['$schema'] = json_schema_uri
+    result['$ref'] = definitions_prefix + root
+    result['definitions'] = result_definitions
+
+    return result
+
+
+_type_checks = {
+    'array': 'isinstance({0}, list)',
+    'boolean': 'isinstance({0}, bool)',
+    'integer': 'isinstance({0}, int) and not isinstance({0}, bool)',
+    'null': '{0} is None',
+    'number': (
+        'isinstance({0}, (int, float)) and not isinstance({0}, bool)'
+    ),
+    'object': 'isinstance({0}, dict)',
+    'string': 'isinstance({0}, str)',
+}
+
+
+class _Generator(object):
+    def __init__(self, definitions):
+        self.definitions = definitions
+        self.names = collections.OrderedDict(
+            (tag, '_validate_{}'.format(index))
+            for index, tag in enumerate(definitions)
+        )
+        self.lines = []
+        self.constants = {}
+        self.dispatches = []
+        self.depth = 0
+
+    def emit(self, indent, line):
+        self.lines.append('    ' * indent + line)
+
+    def constant(self, value):
+        name = '_constant_{}'.format(len(self.constants))
+        self.constants[name] = value
+        return name
+
+    def fail(self, indent, path, message):
+        self.emit(indent, 'raise InvalidDocument({}, {!r})'.format(
+            path,
+            message,
+        ))
+
+    def type_constant(self, node):
+        definition = self.definitions[node['$ref'][len(definitions_prefix):]]
+        properties = definition['properties']
+        return properties[graham.core.type_attribute_name]['const']
+
+    def reference_name(self, node):
+        return self.names[node['$ref'][len(definitions_prefix):]]
+
+    def node(self, node, value, path, indent):
+        if '$ref' in node:
+            self.emit(indent, '{}({}, {})'.format(
+                self.reference_name(node),
+                value,
+                path,
+            ))
+            return
+
+        if 'anyOf' in node:
+            nullable, = [
+                each for each in node['anyOf'] if each != {'type': 'null'}
+            ]
+            self.emit(indent, 'if {} is not None:'.format(value))
+            self.node(nullable, value, path, indent + 1)
+            return
+
+        if 'oneOf' in node:
+            name = '_dispatch_{}'.format(len(self.dispatches))
+            self.dispatches.append((name, [
+                (self.type_constant(each), self.reference_name(each))
+                for each in node['oneOf']
+            ]))
+            self.emit(indent, 'if not isinstance({}, dict):'.format(value))
+            self.fail(indent + 1, path, 'expected object')
+            self.emit(indent, 'validate = {}.get({}.get({!r}))'.format(
+                name,
+                value,
+                graham.core.type_attribute_name,
+            ))
+            self.emit(indent, 'if validate is None:')
+            self.fail(indent + 1, path, 'unknown type')
+            self.emit(indent, 'validate({}, {})'.format(value, path))
+            return
+
+        if 'const' in node:
+            self.emit(indent, 'if {} != {}:'.format(
+                value,
+                self.constant(node['const']),
+            ))
+            self.fail(indent + 1, path, 'expected {!r}'.format(node['const']))
+            return
+
+        types = node.get('type')
+        if types is None:
+            return
+        if not isinstance(types, list):
+            types = [types]
+
+        checks = [_type_checks[each].format(value) for each in types]
+        if len(checks) > 1:
+            checks = ['({})'.format(check) for check in checks]
+        self.emit(indent, 'if not ({}):'.format(' or '.join(checks)))
+        self.fail(indent + 1, path, 'expected {}'.format(' or '.join(types)))
+
+        items = node.get('items')
+        if items is not None:
+            self.depth += 1
+            index = 'i{}'.format(self.depth)
+            item = 'v{}'.format(self.depth)
+            if 'null' in types:
+                self.emit(indent, 'if {} is not None:'.format(value))
+                indent += 1
+            self.emit(indent, 'for {}, {} in enumerate({}):'.format(
+                index,
+                item,
+                value,
+            ))
+            self.node(
+                items,
+                item,
+                '{} + ({},)'.format(path, index),
+                indent + 1,
+            )
+
+    def definition(self, tag):
+        definition = self.definitions[tag]
+
+        self.emit(0, 'def {}(d, path):'.format(self.names[tag]))
+        self.emit(1, 'if not isinstance(d, dict):')
+        self.fail(2, 'path', 'expected object')
+
+        required = definition.get('required', ())
+        for key, node in definition['properties'].items():
+            self.depth = 0
+            path = 'path + ({!r},)'.format(key)
+            self.emit(1, 'v = d.get({!r}, missing)'.format(key))
+            if key in required:
+                self.emit(1, 'if v is missing:')
+                self.fail(2, path, 'required')
+                self.node(node, 'v', path, 1)
+            else:
+                before = len(self.lines)
+                self.emit(1, 'if v is not missing:')
+                self.node(node, 'v', path, 2)
+                if len(self.lines) == before + 1:
+                    del self.lines[before:]
+
+        self.emit(0, '')
+        self.emit(0, '')
+
+    def generate(self, root):
+        for tag in self.definitions:
+            self.definition(tag)
+
+        for name, dispatch in self.dispatches:
+            self.emit(0, '{} = {{'.format(name))
+            for type_, function in dispatch:
+                self.emit(1, '{!r}: {},'.format(type_, function))
+            self.emit(0, '}')
+        if self.dispatches:
+            self.emit(0, '')
+            self.emit(0, '')
+
+        self.emit(0, 'def validate(d):')
+        self.emit(1, '{}(d, ())'.format(self.names[root]))
+
+        return '\n'.join(self.lines) + '\n'
+
+
+def compile_validator(cls):
+    schema = json_schema(cls)
+
+    generator = _Generator(definitions=schema['definitions'])
+    source = generator.generate(
+        root=schema['$ref'][len(definitions_prefix):],
+    )
+
+    namespace = dict(generator.constants)
+    namespace['InvalidDocument'] = InvalidDocument
+    namespace['missing'] = graham.iterative.missing
+    exec(compile(source, '<graham validator {}>'.format(cls.__name__), 'exec'),
+         namespace)
+
+    validate = namespace['validate']
+    validate.source = source
+
+    return validate